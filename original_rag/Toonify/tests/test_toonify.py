@@ -0,0 +1,58 @@
+"""
+Toonify parser tests
+
+Usage:
+    cd Toonify
+    python -m pytest tests -v
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import toonify
+
+
+class TestParseJsTs:
+    """Test the regex-based JS/TS parser"""
+
+    def test_multiline_method_signature_keeps_following_functions(self):
+        # The method pattern's return type runs from `field(...): this;` to
+        # the next `{`, across the declarations below it
+        content = b"""export declare class Def {
+    build(...fields: string[]): this;
+    field(name: string, type: any, defaultFn?: Function): this;
+}
+export function typesPlugin(fork: Fork): {
+    Type: any;
+};
+export const initializer = (inst: any, issues: any[]) => {
+  return inst;
+};
+"""
+        result = toonify.parse_js_ts(content, "types.d.ts")
+        lines = {f["name"]: f["line_start"] for f in result["functions"]}
+
+        assert lines["build"] == 2
+        assert lines["typesPlugin"] == 5
+        assert lines["initializer"] == 8
+
+
+class TestParsePython:
+    """Test the AST-based Python parser"""
+
+    def test_entries_in_breadth_first_order(self):
+        content = """def get_event_loop():
+    return loop()
+
+
+class Policy:
+    def get_event_loop(self):
+        return self.new_loop()
+"""
+        result = toonify.parse_python(content, "events.py")
+
+        # Module-level definitions come before nested ones, so the method,
+        # reached later, owns the calls entry for the shared name
+        assert [f["line_start"] for f in result["functions"]] == [1, 6]
+        assert result["calls"]["get_event_loop"] == ["new_loop"]
@@ -29,17 +29,28 @@ import sys
 import ast
 import re
 import json
+import mmap
 import hashlib
+from bisect import bisect_left
+from collections import deque
+from contextlib import closing
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import AnyStr, Dict, Iterator, List, Any, Optional, Pattern, Set, Tuple
+
+try:
+    import sqlite3
+except ImportError:  # Python built without SQLite - run without the parse cache
+    sqlite3 = None
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
 # Directories to always ignore
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     '.git', '.svn', '.hg', '.bzr',
     'node_modules', '__pycache__', '.pytest_cache', '.mypy_cache',
     'venv', '.venv', 'env', '.env', 'virtualenv',
@@ -47,21 +58,21 @@ IGNORE_DIRS = {
     'coverage', '.coverage', 'htmlcov', '.nyc_output',
     '.idea', '.vscode', '.vs', '.eclipse',
     'vendor', 'packages', 'bower_components',
-    '.tox', '.nox', '.eggs', '*.egg-info',
+    '.tox', '.nox', '.eggs',  # *.egg-info is matched by suffix in discover_files
     'target', 'out', 'bin', 'obj', 'debug', 'release',  # Rust/Java/C#
     '.architectzero', '.cache', 'tmp', 'temp',
     'Cargo.lock',  # Rust lock file dir if exists
-}
+})
 
 # Files to always ignore
-IGNORE_FILES = {
+IGNORE_FILES = frozenset({
     'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml',
     'Cargo.lock', 'Gemfile.lock', 'poetry.lock',
     '.DS_Store', 'Thumbs.db',
-}
+})
 
 # File extensions to index
-CODE_EXTENSIONS = {
+CODE_EXTENSIONS = frozenset({
     '.py', '.pyw', '.pyi',       # Python (including stubs)
     '.js', '.jsx', '.mjs', '.cjs',  # JavaScript
     '.ts', '.tsx', '.mts', '.cts',  # TypeScript
@@ -80,7 +91,7 @@ CODE_EXTENSIONS = {
     '.ex', '.exs',               # Elixir
     '.erl', '.hrl',              # Erlang
     '.zig',                      # Zig
-}
+})
 
 # Extension to language mapping
 LANG_MAP = {
@@ -98,55 +109,94 @@ LANG_MAP = {
 }
 
 # Master languages get comprehensive parsing
-MASTER_LANGUAGES = {'python', 'javascript', 'typescript', 'rust'}
+MASTER_LANGUAGES = frozenset({'python', 'javascript', 'typescript', 'rust'})
 
 
 # =============================================================================
 # FILE DISCOVERY
 # =============================================================================
 
-def discover_files(root: Path) -> List[Path]:
+def file_extension(name: str) -> str:
+    """Lowercased extension of a file name, matching Path.suffix without building a Path."""
+    dot = name.rfind('.')
+    # A leading dot marks a hidden file, not an extension ('.eslintrc')
+    return name[dot:].lower() if dot > 0 else ''
+
+
+def discover_files(root: Path) -> List[str]:
     """Find all code files in directory tree."""
     files = []
+    stack = [str(root)]
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Filter out ignored directories (modifies in-place)
-        dirnames[:] = [d for d in dirnames
-                       if d not in IGNORE_DIRS
-                       and not d.startswith('.')
-                       and not d.endswith('.egg-info')]
+    # Manual walk over os.scandir: entry types come from the cached dirent,
+    # and paths stay plain strings (open() and os.stat() take them directly)
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue  # Unreadable directory (os.walk skips these too)
+
+        with entries:
+            for entry in entries:
+                name = entry.name
+                # Symlinked directories are not followed, as with os.walk
+                if entry.is_dir(follow_symlinks=False):
+                    if (name not in IGNORE_DIRS
+                            and not name.startswith('.')
+                            and not name.endswith('.egg-info')):
+                        stack.append(entry.path)
+                elif name not in IGNORE_FILES and file_extension(name) in CODE_EXTENSIONS:
+                    files.append(entry.path)
+
+    # Order by path components, as sorting Path objects did ('a/b' < 'a-b')
+    files.sort(key=lambda path: path.replace(os.sep, '\0'))
+    return files
+
+
+def get_file_hash(data: bytes) -> str:
+    """
+    Get short hash of raw file bytes (12 hex chars).
 
-        for filename in filenames:
-            if filename in IGNORE_FILES:
-                continue
-            ext = Path(filename).suffix.lower()
-            if ext in CODE_EXTENSIONS:
-                files.append(Path(dirpath) / filename)
+    BLAKE2b is the fastest hash in hashlib on 64-bit CPUs and releases the
+    GIL on large inputs. A non-cryptographic hash such as xxh3 would be
+    faster still, but needs a third-party package, and the hash column must
+    not depend on what happens to be installed.
+    """
+    return hashlib.blake2b(data, digest_size=6).hexdigest()
 
-    return sorted(files)
 
+# =============================================================================
+# LINE OFFSETS
+# =============================================================================
 
-def get_file_hash(content: str) -> str:
-    """Get short hash of file content."""
-    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+NEWLINE_RE = re.compile('\n')
+NEWLINE_BYTES_RE = re.compile(b'\n')
+
+
+def build_line_index(content) -> List[int]:
+    """
+    Offsets of every newline in content (str, bytes or mmap), in ascending order.
+
+    The scan itself runs inside the regex engine; the only per-newline Python
+    work is appending the offset. (split()+accumulate() measured slower, and
+    NumPy would break the zero-dependency promise.)
+
+    Parsers whose matches all come from one in-order scan (Rust, generic)
+    skip the table and count newlines between consecutive matches instead.
+    """
+    pattern = NEWLINE_RE if isinstance(content, str) else NEWLINE_BYTES_RE
+    return [m.start() for m in pattern.finditer(content)]
+
+
+def line_at(newlines: List[int], pos: int) -> int:
+    """1-based line number of offset pos, via binary search over build_line_index()."""
+    return bisect_left(newlines, pos) + 1
 
 
 # =============================================================================
 # PYTHON PARSER (AST-based - comprehensive)
 # =============================================================================
 
-def extract_python_calls(node: ast.AST) -> List[str]:
-    """Extract function calls from an AST node."""
-    calls = []
-    for child in ast.walk(node):
-        if isinstance(child, ast.Call):
-            if isinstance(child.func, ast.Name):
-                calls.append(child.func.id)
-            elif isinstance(child.func, ast.Attribute):
-                calls.append(child.func.attr)
-    return list(set(calls))
-
-
 def get_python_decorators(node: ast.AST) -> List[str]:
     """Extract decorator names from a function/class node."""
     decorators = []
@@ -165,98 +215,162 @@ def get_python_decorators(node: ast.AST) -> List[str]:
 
 def get_docstring(node: ast.AST) -> Optional[str]:
     """Extract first line of docstring if present."""
-    docstring = ast.get_docstring(node)
+    # Inlined ast.get_docstring: only the first non-blank line is needed, so
+    # skip inspect.cleandoc's dedent of the whole docstring
+    body = node.body
+    if not body or type(body[0]) is not ast.Expr:
+        return None
+    value = body[0].value
+    if type(value) is not ast.Constant or type(value.value) is not str:
+        return None
+    first_line = value.value.lstrip().partition('\n')[0].strip().expandtabs()
+    return first_line[:100] or None
+
+
+def _python_function(node: ast.AST, scopes: Tuple[Set[str], ...],
+                     result: Dict[str, Any]) -> Tuple[Set[str], ...]:
+    """Functions and methods. Opens a new call scope for the body."""
+    decorators = get_python_decorators(node)
+    docstring = get_docstring(node)
+
+    func_info = {
+        "name": node.name,
+        "line_start": node.lineno,
+        "line_end": node.end_lineno or node.lineno,
+        "is_async": type(node) is ast.AsyncFunctionDef,
+    }
+    if decorators:
+        func_info["decorators"] = decorators
+    if docstring:
+        func_info["doc"] = docstring
+
+    result["functions"].append(func_info)
+    result["calls"][node.name] = calls = set()
+    return scopes + (calls,)
+
+
+def _python_class(node: ast.AST, scopes: Tuple[Set[str], ...],
+                  result: Dict[str, Any]) -> Tuple[Set[str], ...]:
+    """Classes, with their base classes."""
+    decorators = get_python_decorators(node)
+    docstring = get_docstring(node)
+
+    # Get base classes
+    bases = []
+    for base in node.bases:
+        if isinstance(base, ast.Name):
+            bases.append(base.id)
+        elif isinstance(base, ast.Attribute):
+            bases.append(base.attr)
+
+    export_info = {
+        "name": node.name,
+        "line": node.lineno,
+        "kind": "class"
+    }
+    if bases:
+        export_info["bases"] = bases
+    if decorators:
+        export_info["decorators"] = decorators
     if docstring:
-        first_line = docstring.split('\n')[0].strip()
-        return first_line[:100] if len(first_line) > 100 else first_line
-    return None
+        export_info["doc"] = docstring
 
+    result["exports"].append(export_info)
+    return scopes
 
-def parse_python(content: str, filepath: Path) -> Dict[str, Any]:
+
+def _python_import(node: ast.AST, scopes: Tuple[Set[str], ...],
+                   result: Dict[str, Any]) -> Tuple[Set[str], ...]:
+    """import a.b as c"""
+    imports = result["imports"]
+    for alias in node.names:
+        imports.append({
+            "module": alias.name,
+            "name": alias.asname or alias.name,
+            "line": node.lineno,
+            "kind": "import",
+        })
+    return scopes
+
+
+def _python_import_from(node: ast.AST, scopes: Tuple[Set[str], ...],
+                        result: Dict[str, Any]) -> Tuple[Set[str], ...]:
+    """from a.b import c"""
+    imports = result["imports"]
+    module = node.module or ""
+    for alias in node.names:
+        imports.append({
+            "module": module,
+            "name": alias.name,
+            "line": node.lineno,
+            "kind": "from",
+        })
+    return scopes
+
+
+def _python_call(node: ast.AST, scopes: Tuple[Set[str], ...],
+                 result: Dict[str, Any]) -> Tuple[Set[str], ...]:
+    """Calls inside a function body count towards every enclosing function."""
+    func = node.func
+    if type(func) is ast.Name:
+        for calls in scopes:
+            calls.add(func.id)
+    elif type(func) is ast.Attribute:
+        for calls in scopes:
+            calls.add(func.attr)
+    return scopes
+
+
+# Node handlers keyed by exact type - AST nodes are never subclassed, so a
+# dict hit replaces a chain of isinstance checks on every visited node
+PYTHON_NODE_HANDLERS = {
+    ast.FunctionDef: _python_function,
+    ast.AsyncFunctionDef: _python_function,
+    ast.ClassDef: _python_class,
+    ast.Import: _python_import,
+    ast.ImportFrom: _python_import_from,
+    ast.Call: _python_call,
+}
+
+
+def parse_python(content: str, filepath: str) -> Dict[str, Any]:
     """Parse Python file for functions, classes, imports, and call relationships."""
     try:
-        tree = ast.parse(content)
+        tree = ast.parse(content, filename=filepath, type_comments=False)
     except SyntaxError:
         return {"functions": [], "imports": [], "exports": [], "calls": {}}
 
-    functions = []
-    imports = []
-    exports = []
-    call_graph = {}  # function_name -> [called_functions]
-
-    for node in ast.walk(tree):
-        # Functions and methods
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            decorators = get_python_decorators(node)
-            docstring = get_docstring(node)
-            calls = extract_python_calls(node)
-
-            func_info = {
-                "name": node.name,
-                "line_start": node.lineno,
-                "line_end": node.end_lineno or node.lineno,
-                "is_async": isinstance(node, ast.AsyncFunctionDef),
-            }
-            if decorators:
-                func_info["decorators"] = decorators
-            if docstring:
-                func_info["doc"] = docstring
-
-            functions.append(func_info)
-            call_graph[node.name] = calls
-
-        # Classes
-        elif isinstance(node, ast.ClassDef):
-            decorators = get_python_decorators(node)
-            docstring = get_docstring(node)
-
-            # Get base classes
-            bases = []
-            for base in node.bases:
-                if isinstance(base, ast.Name):
-                    bases.append(base.id)
-                elif isinstance(base, ast.Attribute):
-                    bases.append(base.attr)
-
-            export_info = {
-                "name": node.name,
-                "line": node.lineno,
-                "kind": "class"
-            }
-            if bases:
-                export_info["bases"] = bases
-            if decorators:
-                export_info["decorators"] = decorators
-            if docstring:
-                export_info["doc"] = docstring
-
-            exports.append(export_info)
-
-        # Imports
-        elif isinstance(node, ast.Import):
-            for alias in node.names:
-                imports.append({
-                    "module": alias.name,
-                    "name": alias.asname or alias.name,
-                    "line": node.lineno,
-                    "kind": "import",
-                })
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module or ""
-            for alias in node.names:
-                imports.append({
-                    "module": module,
-                    "name": alias.name,
-                    "line": node.lineno,
-                    "kind": "from",
-                })
+    # call graph: function_name -> {called_functions}
+    result = {"functions": [], "imports": [], "exports": [], "calls": {}}
+    handlers = PYTHON_NODE_HANDLERS
+    expr = ast.expr
+    iter_child_nodes = ast.iter_child_nodes
+
+    # Single breadth-first walk, in the same order as ast.walk, so entries come
+    # out as before and a later definition of a name (e.g. a nested method
+    # after a module-level function) still takes over its calls entry. Each
+    # queue entry carries the call sets of every enclosing function, so calls
+    # are collected in the same pass (a nested function's calls also count
+    # towards its parents).
+    queue = deque([(tree, ())])
+    while queue:
+        node, scopes = queue.popleft()
+
+        handler = handlers.get(type(node))
+        if handler is not None:
+            scopes = handler(node, scopes, result)
+
+        # Outside any function only statements matter - expressions cannot
+        # contain defs, classes or imports, so module/class-level expression
+        # trees are skipped
+        if scopes:
+            queue.extend([(child, scopes) for child in iter_child_nodes(node)])
+        else:
+            queue.extend([(child, scopes) for child in iter_child_nodes(node)
+                          if not isinstance(child, expr)])
 
-    return {
-        "functions": functions,
-        "imports": imports,
-        "exports": exports,
-        "calls": call_graph
-    }
+    result["calls"] = {name: list(called) for name, called in result["calls"].items()}
+    return result
 
 
 # =============================================================================
@@ -266,141 +380,216 @@ def parse_python(content: str, filepath: Path) -> Dict[str, Any]:
 # Function patterns
 JS_FUNCTION_PATTERNS = [
     # export async function name<T>(
-    re.compile(r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(\w+)\s*(?:<[^>]*>)?\s*\(', re.MULTILINE),
+    re.compile(rb'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(\w+)\s*(?:<[^>]*>)?\s*\(', re.MULTILINE),
     # const name = async (params) =>
-    re.compile(r'^\s*(?:export\s+)?(?:const|let|var)\s+(\w+)\s*(?::\s*[^=]+)?\s*=\s*(?:async\s+)?\([^)]*\)\s*(?::\s*[^=]+)?\s*=>', re.MULTILINE),
+    re.compile(rb'^\s*(?:export\s+)?(?:const|let|var)\s+(\w+)\s*(?::\s*[^=]+)?\s*=\s*(?:async\s+)?\([^)]*\)\s*(?::\s*[^=]+)?\s*=>', re.MULTILINE),
     # const name = function(
-    re.compile(r'^\s*(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?function\s*\(', re.MULTILINE),
+    re.compile(rb'^\s*(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?function\s*\(', re.MULTILINE),
     # class method: async name(
-    re.compile(r'^\s+(?:static\s+)?(?:async\s+)?(?:get\s+|set\s+)?(\w+)\s*(?:<[^>]*>)?\s*\([^)]*\)\s*(?::\s*[^{]+)?\s*\{', re.MULTILINE),
+    re.compile(rb'^\s+(?:static\s+)?(?:async\s+)?(?:get\s+|set\s+)?(\w+)\s*(?:<[^>]*>)?\s*\([^)]*\)\s*(?::\s*[^{]+)?\s*\{', re.MULTILINE),
     # React hooks: const [state, setState] = useState - capture the hook name
-    re.compile(r'^\s*(?:const|let)\s+\[[^\]]+\]\s*=\s*(use\w+)\s*\(', re.MULTILINE),
+    re.compile(rb'^\s*(?:const|let)\s+\[[^\]]+\]\s*=\s*(use\w+)\s*\(', re.MULTILINE),
 ]
 
 # Class patterns
 JS_CLASS_PATTERNS = [
     # class Name extends Base implements Interface
-    re.compile(r'^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?', re.MULTILINE),
+    re.compile(rb'^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?', re.MULTILINE),
 ]
 
 # Import patterns
 JS_IMPORT_PATTERNS = [
     # import { x } from 'module'
-    re.compile(r'^\s*import\s+(?:type\s+)?(?:\{[^}]+\}|\*\s+as\s+\w+|\w+)?\s*(?:,\s*(?:\{[^}]+\}|\*\s+as\s+\w+))?\s*from\s+[\'"]([^\'"]+)[\'"]', re.MULTILINE),
+    re.compile(rb'^\s*import\s+(?:type\s+)?(?:\{[^}]+\}|\*\s+as\s+\w+|\w+)?\s*(?:,\s*(?:\{[^}]+\}|\*\s+as\s+\w+))?\s*from\s+[\'"]([^\'"]+)[\'"]', re.MULTILINE),
     # import 'module' (side effect)
-    re.compile(r'^\s*import\s+[\'"]([^\'"]+)[\'"]', re.MULTILINE),
+    re.compile(rb'^\s*import\s+[\'"]([^\'"]+)[\'"]', re.MULTILINE),
     # require('module')
-    re.compile(r'(?:const|let|var)\s+(?:\{[^}]+\}|\w+)\s*=\s*require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', re.MULTILINE),
+    re.compile(rb'(?:const|let|var)\s+(?:\{[^}]+\}|\w+)\s*=\s*require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', re.MULTILINE),
 ]
 
 # Export patterns
 JS_EXPORT_PATTERNS = [
     # export class/function/const/interface/type/enum
-    re.compile(r'^\s*export\s+(?:default\s+)?(?:abstract\s+)?(?:class|function|const|let|var|interface|type|enum)\s+(\w+)', re.MULTILINE),
+    re.compile(rb'^\s*export\s+(?:default\s+)?(?:abstract\s+)?(?:class|function|const|let|var|interface|type|enum)\s+(\w+)', re.MULTILINE),
     # export default name
-    re.compile(r'^\s*export\s+default\s+(\w+)\s*;?\s*$', re.MULTILINE),
+    re.compile(rb'^\s*export\s+default\s+(\w+)\s*;?\s*$', re.MULTILINE),
     # module.exports = name
-    re.compile(r'^\s*module\.exports\s*=\s*(\w+)', re.MULTILINE),
+    re.compile(rb'^\s*module\.exports\s*=\s*(\w+)', re.MULTILINE),
 ]
 
 # TypeScript-specific patterns
+# (pattern, export kind) - the kind is tagged here rather than inferred per match
 TS_TYPE_PATTERNS = [
     # interface Name<T> extends Base
-    re.compile(r'^\s*(?:export\s+)?interface\s+(\w+)(?:<[^>]*>)?(?:\s+extends\s+([^{]+))?', re.MULTILINE),
+    (re.compile(rb'^\s*(?:export\s+)?interface\s+(\w+)(?:<[^>]*>)?(?:\s+extends\s+([^{]+))?', re.MULTILINE),
+     "interface"),
     # type Name<T> = ...
-    re.compile(r'^\s*(?:export\s+)?type\s+(\w+)(?:<[^>]*>)?\s*=', re.MULTILINE),
+    (re.compile(rb'^\s*(?:export\s+)?type\s+(\w+)(?:<[^>]*>)?\s*=', re.MULTILINE), "type"),
     # enum Name
-    re.compile(r'^\s*(?:export\s+)?(?:const\s+)?enum\s+(\w+)', re.MULTILINE),
+    (re.compile(rb'^\s*(?:export\s+)?(?:const\s+)?enum\s+(\w+)', re.MULTILINE), "enum"),
 ]
 
+# Control-flow keywords the method pattern also matches (`if (...) {`)
+JS_SKIP_NAMES = frozenset({
+    b'if', b'for', b'while', b'switch', b'catch', b'constructor',
+    b'return', b'throw', b'new', b'typeof', b'delete', b'void',
+    b'case', b'default', b'try', b'finally', b'else',
+})
+
 # Decorator pattern (TS/experimental JS)
-JS_DECORATOR_PATTERN = re.compile(r'^\s*@(\w+)(?:\([^)]*\))?\s*$', re.MULTILINE)
+JS_DECORATOR_PATTERN = re.compile(rb'^\s*@(\w+)(?:\([^)]*\))?\s*$', re.MULTILINE)
+
 
+def fuse_patterns(patterns: List[Pattern], prelude: Optional[AnyStr] = None,
+                  first_chars: Optional[AnyStr] = None) -> Tuple[Pattern, Dict[str, int]]:
+    r"""
+    Combine patterns into one alternation so a single scan finds them all.
 
-def find_js_block_end(content: str, start: int) -> int:
+    Each pattern is wrapped in a named group p<i>. match.lastgroup tells which
+    one fired, and the returned map gives the number of its first capture group.
+    Works for str and bytes patterns; all patterns must share the same flags.
+
+    If every pattern starts with the same prelude (e.g. r'^\s*'), it is matched
+    once ahead of the alternation, followed by a lookahead for first_chars (a
+    character class covering how any alternative can begin). Positions where
+    no alternative can start are then rejected without trying each one.
+    """
+    sources = [pattern.pattern for pattern in patterns]
+    if isinstance(sources[0], bytes):
+        template, separator, guarded = b'(?P<p%d>%s)', b'|', b'%s(?=%s)(?:%s)'
+    else:
+        template, separator, guarded = '(?P<p%d>%s)', '|', '%s(?=%s)(?:%s)'
+    if prelude:
+        sources = [source.lstrip() for source in sources]
+        assert all(source.startswith(prelude) for source in sources), prelude
+        sources = [source[len(prelude):] for source in sources]
+    alternation = separator.join(template % (i, source) for i, source in enumerate(sources))
+    if prelude:
+        alternation = guarded % (prelude, first_chars, alternation)
+    fused = re.compile(alternation, patterns[0].flags)
+    first_capture = {name: index + 1 for name, index in fused.groupindex.items()}
+    return fused, first_capture
+
+
+# One pass per category instead of one per pattern (except functions, see
+# parse_js_ts). Where every pattern starts at a line start, the shared ^\s* is
+# matched once and guarded by the initials of the keywords that can follow it
+# (export default abstract class, module, interface type const enum)
+JS_CLASS_RE, JS_CLASS_GROUPS = fuse_patterns(JS_CLASS_PATTERNS, prelude=rb'^\s*', first_chars=rb'[acde]')
+JS_IMPORT_RE, JS_IMPORT_GROUPS = fuse_patterns(JS_IMPORT_PATTERNS)
+JS_EXPORT_RE, JS_EXPORT_GROUPS = fuse_patterns(JS_EXPORT_PATTERNS, prelude=rb'^\s*', first_chars=rb'[em]')
+TS_TYPE_RE, TS_TYPE_GROUPS = fuse_patterns(
+    [pattern for pattern, _ in TS_TYPE_PATTERNS], prelude=rb'^\s*', first_chars=rb'[ceit]',
+)
+TS_TYPE_KINDS = {f'p{i}': kind for i, (_, kind) in enumerate(TS_TYPE_PATTERNS)}
+
+
+# Characters that can change find_js_block_end's state; the regex skips the rest in C
+JS_BLOCK_TOKEN_RE = re.compile(rb'[/\n"\'`{}]')
+
+
+def find_js_block_end(content: bytes, start: int) -> int:
     """Find matching closing brace for JS/TS."""
-    brace_pos = content.find('{', start)
+    brace_pos = content.find(b'{', start)
     if brace_pos == -1:
         return start + 1
 
     depth = 1
-    i = brace_pos + 1
     in_string = False
     string_char = None
     in_template = False
-    in_line_comment = False
-    in_block_comment = False
-    in_regex = False
-
-    while i < len(content) and depth > 0:
-        c = content[i]
-        prev = content[i-1] if i > 0 else ''
 
-        # Handle comments
-        if not in_string and not in_template and not in_regex:
-            if in_line_comment:
-                if c == '\n':
-                    in_line_comment = False
-            elif in_block_comment:
-                if prev == '*' and c == '/':
-                    in_block_comment = False
-            elif c == '/' and i + 1 < len(content):
-                next_c = content[i + 1]
-                if next_c == '/':
-                    in_line_comment = True
-                elif next_c == '*':
-                    in_block_comment = True
+    # Visit only the characters the state machine reacts to; anything else
+    # is a no-op in every state, so skipping it leaves the result unchanged.
+    skip_to = 0
+    for match in JS_BLOCK_TOKEN_RE.finditer(content, brace_pos + 1):
+        i = match.start()
+        if i < skip_to:
+            continue
+        c = content[i:i + 1]
+        prev = content[i - 1:i]
+
+        # Handle comments. Inside one nothing but its terminator matters, so
+        # jump straight past it instead of visiting its tokens one by one
+        if c == b'/' and not in_string and not in_template:
+            next_c = content[i + 1:i + 2]
+            if next_c == b'/':
+                skip_to = content.find(b'\n', i + 2) + 1
+                if not skip_to:
+                    break
+                continue
+            if next_c == b'*':
+                skip_to = content.find(b'*/', i + 1) + 2
+                if skip_to == 1:
+                    break
+                continue
 
         # Handle strings and template literals
-        if not in_line_comment and not in_block_comment and not in_regex:
-            if c == '`' and prev != '\\':
-                in_template = not in_template
-            elif c in ('"', "'") and prev != '\\' and not in_template:
-                if not in_string:
-                    in_string = True
-                    string_char = c
-                elif c == string_char:
-                    in_string = False
+        if c == b'`' and prev != b'\\':
+            in_template = not in_template
+        elif c in (b'"', b"'") and prev != b'\\' and not in_template:
+            if not in_string:
+                in_string = True
+                string_char = c
+            elif c == string_char:
+                in_string = False
 
         # Count braces (only outside strings and comments)
-        if not in_string and not in_template and not in_line_comment and not in_block_comment:
-            if c == '{':
+        elif not in_string and not in_template:
+            if c == b'{':
                 depth += 1
-            elif c == '}':
+            elif c == b'}':
                 depth -= 1
+                if depth == 0:
+                    return i + 1
 
-        i += 1
+    return len(content)
 
-    return i
 
+def parse_js_ts(content: bytes, filepath: str) -> Dict[str, Any]:
+    """
+    Parse JS/TS file comprehensively.
 
-def parse_js_ts(content: str, filepath: Path) -> Dict[str, Any]:
-    """Parse JS/TS file comprehensively."""
+    Works on the raw file bytes: every pattern is ASCII, so scanning bytes
+    skips the UTF-8 decode. Only captured names are decoded.
+    """
     functions = []
     imports = []
     exports = []
     call_graph = {}
 
+    newlines = build_line_index(content)
+
+    # Module-level names used inside the match loops, bound once as locals
+    intern = sys.intern
+    find_line = line_at
+    find_block_end = find_js_block_end
+    class_groups, import_groups = JS_CLASS_GROUPS, JS_IMPORT_GROUPS
+    export_groups, type_groups, type_kinds = JS_EXPORT_GROUPS, TS_TYPE_GROUPS, TS_TYPE_KINDS
+    skip_names = JS_SKIP_NAMES
+
+    # Dedupe on the raw captured bytes; only first occurrences get decoded.
+    # Names are interned so repeats across files share one object.
     seen_functions = set()
-    skip_names = {'if', 'for', 'while', 'switch', 'catch', 'constructor',
-                  'return', 'throw', 'new', 'typeof', 'delete', 'void',
-                  'case', 'default', 'try', 'finally', 'else'}
 
-    # Functions
+    # Functions. Scanned pattern by pattern, not fused: the method pattern's
+    # return type ([^{]+) can run over several lines, and in one alternation
+    # that match would swallow the declarations of the other patterns inside it
     for pattern in JS_FUNCTION_PATTERNS:
         for match in pattern.finditer(content):
-            name = match.group(1)
-            if name in seen_functions or name in skip_names:
+            raw = match.group(1)
+            if raw in seen_functions or raw in skip_names:
                 continue
-            seen_functions.add(name)
+            seen_functions.add(raw)
+            name = intern(raw.decode())
 
-            line_start = content[:match.start()].count('\n') + 1
+            line_start = find_line(newlines, match.start())
             line_end = line_start
 
             # Try to find function end
-            block_end = find_js_block_end(content, match.end())
+            block_end = find_block_end(content, match.end())
             if block_end > match.end():
-                line_end = content[:block_end].count('\n') + 1
+                line_end = find_line(newlines, block_end)
 
             functions.append({
                 "name": name,
@@ -410,54 +599,56 @@ def parse_js_ts(content: str, filepath: Path) -> Dict[str, Any]:
 
     # Classes
     seen_exports = set()
-    for pattern in JS_CLASS_PATTERNS:
-        for match in pattern.finditer(content):
-            name = match.group(1)
-            if name not in seen_exports:
-                seen_exports.add(name)
-                line_num = content[:match.start()].count('\n') + 1
-                export_info = {"name": name, "line": line_num, "kind": "class"}
-
-                # Capture extends
-                if match.lastindex >= 2 and match.group(2):
-                    export_info["extends"] = match.group(2).strip()
+    for match in JS_CLASS_RE.finditer(content):
+        group = class_groups[match.lastgroup]
+        raw = match.group(group)
+        if raw not in seen_exports:
+            seen_exports.add(raw)
+            name = intern(raw.decode())
+            line_num = find_line(newlines, match.start())
+            export_info = {"name": name, "line": line_num, "kind": "class"}
+
+            # Capture extends
+            extends = match.group(group + 1)
+            if extends:
+                export_info["extends"] = extends.strip().decode('utf-8', 'replace')
 
-                exports.append(export_info)
+            exports.append(export_info)
 
     # Imports
-    for pattern in JS_IMPORT_PATTERNS:
-        for match in pattern.finditer(content):
-            module = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            imports.append({
-                "module": module,
-                "line": line_num,
-            })
+    for match in JS_IMPORT_RE.finditer(content):
+        module = match.group(import_groups[match.lastgroup]).decode('utf-8', 'replace')
+        line_num = find_line(newlines, match.start())
+        imports.append({
+            "module": module,
+            "line": line_num,
+        })
 
     # Exports
-    for pattern in JS_EXPORT_PATTERNS:
-        for match in pattern.finditer(content):
-            name = match.group(1)
-            if name not in seen_exports:
-                seen_exports.add(name)
-                line_num = content[:match.start()].count('\n') + 1
-                exports.append({"name": name, "line": line_num, "kind": "export"})
+    for match in JS_EXPORT_RE.finditer(content):
+        raw = match.group(export_groups[match.lastgroup])
+        if raw not in seen_exports:
+            seen_exports.add(raw)
+            name = intern(raw.decode())
+            line_num = find_line(newlines, match.start())
+            exports.append({"name": name, "line": line_num, "kind": "export"})
 
     # TypeScript types/interfaces
-    for pattern in TS_TYPE_PATTERNS:
-        for match in pattern.finditer(content):
-            name = match.group(1)
-            if name not in seen_exports:
-                seen_exports.add(name)
-                line_num = content[:match.start()].count('\n') + 1
-                kind = "interface" if "interface" in pattern.pattern else "type"
-                export_info = {"name": name, "line": line_num, "kind": kind}
-
-                # Capture extends for interfaces
-                if match.lastindex >= 2 and match.group(2):
-                    export_info["extends"] = match.group(2).strip()
+    for match in TS_TYPE_RE.finditer(content):
+        group = type_groups[match.lastgroup]
+        raw = match.group(group)
+        if raw not in seen_exports:
+            seen_exports.add(raw)
+            name = intern(raw.decode())
+            line_num = find_line(newlines, match.start())
+            kind = type_kinds[match.lastgroup]
+            export_info = {"name": name, "line": line_num, "kind": kind}
+
+            # Capture extends for interfaces
+            if kind == "interface" and match.group(group + 1):
+                export_info["extends"] = match.group(group + 1).strip().decode('utf-8', 'replace')
 
-                exports.append(export_info)
+            exports.append(export_info)
 
     return {
         "functions": functions,
@@ -471,12 +662,17 @@ def parse_js_ts(content: str, filepath: Path) -> Dict[str, Any]:
 # RUST PARSER (Regex-based - COMPREHENSIVE)
 # =============================================================================
 
+# Attribute preludes match #[...] with at most one level of nested brackets and
+# never cross a newline. Each attribute can only be split one way, so a line
+# of attributes that leads to no item fails in linear time (the earlier
+# (?:\#\[.*?\]\s*)* could split it exponentially many ways).
+
 # Function patterns - handles all visibility, async, unsafe, extern, const fn
 RUST_FUNCTION_PATTERNS = [
     # [pub[(crate)]] [async] [unsafe] [extern "C"] [const] fn name
-    re.compile(r'''
+    re.compile(rb'''
         ^\s*
-        (?:\#\[.*?\]\s*)*                    # attributes
+        (?:\#\[[^\[\]\n]*(?:\[[^\[\]\n]*\][^\[\]\n]*)*\]\s*)*  # attributes
         (?:pub(?:\s*\([^)]*\))?\s+)?         # visibility
         (?:default\s+)?                       # default (for trait impls)
         (?:async\s+)?                         # async
@@ -490,9 +686,9 @@ RUST_FUNCTION_PATTERNS = [
 ]
 
 # Struct patterns
-RUST_STRUCT_PATTERN = re.compile(r'''
+RUST_STRUCT_PATTERN = re.compile(rb'''
     ^\s*
-    (?:\#\[.*?\]\s*)*                        # attributes (derive, serde, etc.)
+    (?:\#\[[^\[\]\n]*(?:\[[^\[\]\n]*\][^\[\]\n]*)*\]\s*)*  # attributes (derive, serde, etc.)
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     struct\s+(\w+)                           # struct Name
     (?:<[^>]*>)?                             # generics <T, U>
@@ -501,18 +697,18 @@ RUST_STRUCT_PATTERN = re.compile(r'''
 ''', re.MULTILINE | re.VERBOSE)
 
 # Enum patterns
-RUST_ENUM_PATTERN = re.compile(r'''
+RUST_ENUM_PATTERN = re.compile(rb'''
     ^\s*
-    (?:\#\[.*?\]\s*)*                        # attributes
+    (?:\#\[[^\[\]\n]*(?:\[[^\[\]\n]*\][^\[\]\n]*)*\]\s*)*  # attributes
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     enum\s+(\w+)                             # enum Name
     (?:<[^>]*>)?                             # generics
 ''', re.MULTILINE | re.VERBOSE)
 
 # Trait patterns
-RUST_TRAIT_PATTERN = re.compile(r'''
+RUST_TRAIT_PATTERN = re.compile(rb'''
     ^\s*
-    (?:\#\[.*?\]\s*)*                        # attributes
+    (?:\#\[[^\[\]\n]*(?:\[[^\[\]\n]*\][^\[\]\n]*)*\]\s*)*  # attributes
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     (?:unsafe\s+)?                           # unsafe trait
     (?:auto\s+)?                             # auto trait
@@ -522,7 +718,7 @@ RUST_TRAIT_PATTERN = re.compile(r'''
 ''', re.MULTILINE | re.VERBOSE)
 
 # Impl patterns
-RUST_IMPL_PATTERN_TRAIT_FOR = re.compile(r'''
+RUST_IMPL_PATTERN_TRAIT_FOR = re.compile(rb'''
     ^\s*
     (?:unsafe\s+)?                           # unsafe impl
     impl(?:<[^>]*>)?\s+                      # impl<T>
@@ -531,7 +727,7 @@ RUST_IMPL_PATTERN_TRAIT_FOR = re.compile(r'''
     (\w+)                                    # TypeName
 ''', re.MULTILINE | re.VERBOSE)
 
-RUST_IMPL_PATTERN_TYPE = re.compile(r'''
+RUST_IMPL_PATTERN_TYPE = re.compile(rb'''
     ^\s*
     impl(?:<[^>]*>)?\s+                      # impl<T>
     (\w+)                                    # TypeName
@@ -541,7 +737,7 @@ RUST_IMPL_PATTERN_TYPE = re.compile(r'''
 ''', re.MULTILINE | re.VERBOSE)
 
 # Use/import patterns
-RUST_USE_PATTERN = re.compile(r'''
+RUST_USE_PATTERN = re.compile(rb'''
     ^\s*
     (?:pub(?:\s*\([^)]*\))?\s+)?             # pub use
     use\s+
@@ -556,30 +752,30 @@ RUST_USE_PATTERN = re.compile(r'''
 ''', re.MULTILINE | re.VERBOSE)
 
 # Mod patterns
-RUST_MOD_PATTERN = re.compile(r'''
+RUST_MOD_PATTERN = re.compile(rb'''
     ^\s*
-    (?:\#\[.*?\]\s*)*                        # attributes
+    (?:\#\[[^\[\]\n]*(?:\[[^\[\]\n]*\][^\[\]\n]*)*\]\s*)*  # attributes
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     mod\s+(\w+)                              # mod name
 ''', re.MULTILINE | re.VERBOSE)
 
 # Macro patterns
-RUST_MACRO_RULES_PATTERN = re.compile(r'''
+RUST_MACRO_RULES_PATTERN = re.compile(rb'''
     ^\s*
-    (?:\#\[.*?\]\s*)*                        # attributes
+    (?:\#\[[^\[\]\n]*(?:\[[^\[\]\n]*\][^\[\]\n]*)*\]\s*)*  # attributes
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     macro_rules!\s+(\w+)                     # macro_rules! name
 ''', re.MULTILINE | re.VERBOSE)
 
 # Declarative macro 2.0
-RUST_MACRO_DECL_PATTERN = re.compile(r'''
+RUST_MACRO_DECL_PATTERN = re.compile(rb'''
     ^\s*
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     macro\s+(\w+)                            # macro name
 ''', re.MULTILINE | re.VERBOSE)
 
 # Type alias
-RUST_TYPE_ALIAS_PATTERN = re.compile(r'''
+RUST_TYPE_ALIAS_PATTERN = re.compile(rb'''
     ^\s*
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     type\s+(\w+)                             # type Name
@@ -588,7 +784,7 @@ RUST_TYPE_ALIAS_PATTERN = re.compile(r'''
 ''', re.MULTILINE | re.VERBOSE)
 
 # Const/static
-RUST_CONST_PATTERN = re.compile(r'''
+RUST_CONST_PATTERN = re.compile(rb'''
     ^\s*
     (?:pub(?:\s*\([^)]*\))?\s+)?             # visibility
     (const|static)\s+                        # const or static
@@ -596,54 +792,106 @@ RUST_CONST_PATTERN = re.compile(r'''
     (\w+)\s*:                                # name: Type
 ''', re.MULTILINE | re.VERBOSE)
 
+# (pattern, item kind) in the order parse_rust handles the kinds
+RUST_ITEM_PATTERNS = [(pattern, "fn") for pattern in RUST_FUNCTION_PATTERNS] + [
+    (RUST_STRUCT_PATTERN, "struct"),
+    (RUST_ENUM_PATTERN, "enum"),
+    (RUST_TRAIT_PATTERN, "trait"),
+    (RUST_IMPL_PATTERN_TRAIT_FOR, "impl_for"),
+    (RUST_IMPL_PATTERN_TYPE, "impl"),
+    (RUST_USE_PATTERN, "use"),
+    (RUST_MOD_PATTERN, "mod"),
+    (RUST_MACRO_RULES_PATTERN, "macro_rules"),
+    (RUST_MACRO_DECL_PATTERN, "macro"),
+    (RUST_TYPE_ALIAS_PATTERN, "type"),
+    (RUST_CONST_PATTERN, "const"),
+]
+
+# Every item starts at a line start with a distinct keyword, so one fused scan
+# finds the same matches as a pass per pattern. Each item opens with an
+# attribute or one of these keyword initials: pub default async unsafe extern
+# const fn struct static enum trait auto impl use mod macro type
+#
+# The sources stay VERBOSE for readability. The flag is consumed by the
+# pattern parser, so the compiled program is the same as for a hand-compacted
+# pattern and costs nothing at match time.
+RUST_ITEM_RE, RUST_ITEM_GROUPS = fuse_patterns(
+    [pattern for pattern, _ in RUST_ITEM_PATTERNS], prelude=rb'^\s*', first_chars=rb'[#acdefimpstu]',
+)
+RUST_ITEM_KINDS = {f'p{i}': kind for i, (_, kind) in enumerate(RUST_ITEM_PATTERNS)}
+
+# Characters that can change find_rust_block_end's state: / and * only as
+# comment markers, r only when it opens a raw string
+RUST_BLOCK_TOKEN_RE = re.compile(rb'''[\n"'{}]|/(?=[/*])|\*(?=/)|r(?=#*")''')
+
+# A body with no strings, chars, comments or nested braces before its closing
+# brace (short impls, empty fns) needs no state machine at all
+RUST_SIMPLE_BODY_RE = re.compile(rb'''[^{}"'/]*\}''')
+
 # Attribute extraction
-RUST_ATTRIBUTE_PATTERN = re.compile(r'#\[(\w+)(?:\([^)]*\))?\]')
+RUST_ATTRIBUTE_PATTERN = re.compile(rb'#\[(\w+)(?:\([^)]*\))?\]')
+
+
+def utf8_width(content: bytes, pos: int) -> int:
+    """Byte length of the UTF-8 character starting at pos (1 past the end)."""
+    lead = content[pos] if pos < len(content) else 0
+    return 1 if lead < 0xC0 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
 
 
-def find_rust_block_end(content: str, start: int) -> int:
+def find_rust_block_end(content: bytes, start: int) -> int:
     """Find matching closing brace for Rust, handling comments, strings, raw strings."""
-    brace_pos = content.find('{', start)
+    brace_pos = content.find(b'{', start)
     if brace_pos == -1:
         # Check for ; (function declaration without body, or tuple struct)
-        semi_pos = content.find(';', start)
+        semi_pos = content.find(b';', start)
         if semi_pos != -1 and semi_pos < start + 200:
             return semi_pos
         return start + 1
 
+    simple = RUST_SIMPLE_BODY_RE.match(content, brace_pos + 1)
+    if simple:
+        return simple.end()
+
     depth = 1
-    i = brace_pos + 1
+    i = brace_pos + 1  # Next position the state machine has not consumed
+    length = len(content)
     in_string = False
     in_raw_string = False
     raw_hashes = 0
-    in_char = False
     in_line_comment = False
     in_block_comment = False
     block_comment_depth = 0  # Rust has nested block comments
 
-    while i < len(content) and depth > 0:
-        c = content[i]
-        prev = content[i-1] if i > 0 else ''
+    # Visit only the characters the state machine reacts to; anything else is
+    # a no-op in every state. Tokens inside a span consumed by a multi-character
+    # step (comment markers, char literals, raw string openers) are skipped.
+    for match in RUST_BLOCK_TOKEN_RE.finditer(content, i):
+        if match.start() < i:
+            continue
+        i = match.start()
+        c = content[i:i + 1]
+        prev = content[i - 1:i]
 
         # Handle line comments
-        if not in_string and not in_raw_string and not in_char and not in_block_comment:
+        if not in_string and not in_raw_string and not in_block_comment:
             if in_line_comment:
-                if c == '\n':
+                if c == b'\n':
                     in_line_comment = False
                 i += 1
                 continue
-            elif c == '/' and i + 1 < len(content) and content[i + 1] == '/':
+            elif c == b'/' and content[i + 1:i + 2] == b'/':
                 in_line_comment = True
                 i += 2
                 continue
 
         # Handle block comments (nested in Rust)
-        if not in_string and not in_raw_string and not in_char:
+        if not in_string and not in_raw_string:
             if in_block_comment:
-                if c == '/' and i + 1 < len(content) and content[i + 1] == '*':
+                if c == b'/' and content[i + 1:i + 2] == b'*':
                     block_comment_depth += 1
                     i += 2
                     continue
-                elif c == '*' and i + 1 < len(content) and content[i + 1] == '/':
+                elif c == b'*' and content[i + 1:i + 2] == b'/':
                     block_comment_depth -= 1
                     if block_comment_depth == 0:
                         in_block_comment = False
@@ -651,87 +899,98 @@ def find_rust_block_end(content: str, start: int) -> int:
                     continue
                 i += 1
                 continue
-            elif c == '/' and i + 1 < len(content) and content[i + 1] == '*':
+            elif c == b'/' and content[i + 1:i + 2] == b'*':
                 in_block_comment = True
                 block_comment_depth = 1
                 i += 2
                 continue
 
         # Handle raw strings: r#"..."#
-        if not in_string and not in_char and not in_block_comment:
+        if not in_string:
             if in_raw_string:
-                if c == '"':
+                if c == b'"':
                     # Check for closing hashes
                     end_hashes = 0
                     j = i + 1
-                    while j < len(content) and content[j] == '#':
+                    while content[j:j + 1] == b'#':
                         end_hashes += 1
                         j += 1
                     if end_hashes >= raw_hashes:
                         in_raw_string = False
                         i = j
                         continue
-            elif c == 'r' and i + 1 < len(content):
-                # Count opening hashes
+            elif c == b'r':
+                # Token regex guarantees r#*" - count the opening hashes
                 j = i + 1
-                hashes = 0
-                while j < len(content) and content[j] == '#':
-                    hashes += 1
+                while content[j:j + 1] == b'#':
                     j += 1
-                if j < len(content) and content[j] == '"':
-                    in_raw_string = True
-                    raw_hashes = hashes
-                    i = j + 1
-                    continue
+                in_raw_string = True
+                raw_hashes = j - i - 1
+                i = j + 1
+                continue
 
         # Handle regular strings
-        if not in_raw_string and not in_char and not in_block_comment:
-            if c == '"' and prev != '\\':
+        if not in_raw_string:
+            if c == b'"' and prev != b'\\':
                 in_string = not in_string
                 i += 1
                 continue
 
         # Handle char literals
-        if not in_string and not in_raw_string and not in_block_comment:
-            if c == "'" and prev != '\\':
-                # Check if it's a char literal or lifetime
-                if i + 2 < len(content) and content[i + 2] == "'":
-                    i += 3  # Skip 'x'
-                    continue
-                elif i + 3 < len(content) and content[i + 1] == '\\' and content[i + 3] == "'":
-                    i += 4  # Skip '\n' style
+        if not in_string and not in_raw_string:
+            if c == b"'" and prev != b'\\':
+                # Check if it's a char literal or lifetime. The character may
+                # be multi-byte UTF-8, so step over it by its encoded width
+                width = utf8_width(content, i + 1)
+                if content[i + 1 + width:i + 2 + width] == b"'":
+                    i += 2 + width  # Skip 'x'
                     continue
+                elif content[i + 1:i + 2] == b'\\':
+                    width = utf8_width(content, i + 2)
+                    if content[i + 2 + width:i + 3 + width] == b"'":
+                        i += 3 + width  # Skip '\n' style
+                        continue
 
         # Count braces
-        if not in_string and not in_raw_string and not in_char and not in_block_comment:
-            if c == '{':
+        if not in_string and not in_raw_string:
+            if c == b'{':
                 depth += 1
-            elif c == '}':
+            elif c == b'}':
                 depth -= 1
+                if depth == 0:
+                    return i + 1
 
         i += 1
 
-    return i
+    return length
 
 
-def extract_rust_attributes(content: str, pos: int) -> List[str]:
+def extract_rust_attributes(content: bytes, pos: int) -> List[str]:
     """Extract attributes above a definition."""
     attributes = []
-    lines = content[:pos].split('\n')
-    for line in reversed(lines[-10:]):  # Check up to 10 lines above
-        line = line.strip()
-        if line.startswith('#['):
+    # Walk back line by line with rfind instead of splitting the whole prefix
+    end = pos
+    for _ in range(10):  # Check up to 10 lines above
+        start = content.rfind(b'\n', 0, end) + 1
+        line = content[start:end].strip()
+        if line.startswith(b'#['):
             for match in RUST_ATTRIBUTE_PATTERN.finditer(line):
-                attributes.append(match.group(1))
-        elif line and not line.startswith('//'):
+                attributes.append(match.group(1).decode())
+        elif line and not line.startswith(b'//'):
             break
+        if not start:
+            break
+        end = start - 1
     return attributes
 
 
-def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
+def parse_rust(content: bytes, filepath: str) -> Dict[str, Any]:
     """
     Parse Rust file comprehensively.
 
+    Like parse_js_ts this scans the raw file bytes. Captured names are ASCII
+    (bytes \\w), so only they are decoded.
+
     Extracts:
     - Functions (fn, async fn, unsafe fn, extern fn, const fn)
     - Structs with attributes (derive, serde, etc.)
@@ -752,36 +1011,45 @@ def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
     seen_functions = set()
     seen_exports = set()
 
+    # Scan once and bucket the matches by kind. Each bucket holds
+    # (match, base, line) where match.group(base + 1) is the pattern's first
+    # group. The scan runs in file order, so lines are counted as it goes.
+    items = {kind: [] for _, kind in RUST_ITEM_PATTERNS}
+    line, counted = 1, 0
+    for match in RUST_ITEM_RE.finditer(content):
+        start = match.start()
+        line += content[counted:start].count(b'\n')
+        counted = start
+        group = match.lastgroup
+        items[RUST_ITEM_KINDS[group]].append((match, RUST_ITEM_GROUPS[group] - 1, line))
+
     # Parse functions
-    for pattern in RUST_FUNCTION_PATTERNS:
-        for match in pattern.finditer(content):
-            name = match.group(1)
-            if name in seen_functions:
-                continue
-            seen_functions.add(name)
+    for match, base, line_start in items["fn"]:
+        name = match.group(base + 1).decode()
+        if name in seen_functions:
+            continue
+        seen_functions.add(name)
 
-            line_start = content[:match.start()].count('\n') + 1
-            block_end = find_rust_block_end(content, match.end())
-            line_end = content[:block_end].count('\n') + 1
+        block_end = find_rust_block_end(content, match.end())
+        line_end = line_start + content[match.start():block_end].count(b'\n')
 
-            attributes = extract_rust_attributes(content, match.start())
+        attributes = extract_rust_attributes(content, match.start())
 
-            func_info = {
-                "name": name,
-                "line_start": line_start,
-                "line_end": line_end,
-            }
-            if attributes:
-                func_info["attrs"] = attributes
+        func_info = {
+            "name": name,
+            "line_start": line_start,
+            "line_end": line_end,
+        }
+        if attributes:
+            func_info["attrs"] = attributes
 
-            functions.append(func_info)
+        functions.append(func_info)
 
     # Parse structs
-    for match in RUST_STRUCT_PATTERN.finditer(content):
-        name = match.group(1)
+    for match, base, line_num in items["struct"]:
+        name = match.group(base + 1).decode()
         if name not in seen_exports:
             seen_exports.add(name)
-            line_num = content[:match.start()].count('\n') + 1
             attributes = extract_rust_attributes(content, match.start())
 
             export_info = {"name": name, "line": line_num, "kind": "struct"}
@@ -790,11 +1058,10 @@ def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
             exports.append(export_info)
 
     # Parse enums
-    for match in RUST_ENUM_PATTERN.finditer(content):
-        name = match.group(1)
+    for match, base, line_num in items["enum"]:
+        name = match.group(base + 1).decode()
         if name not in seen_exports:
             seen_exports.add(name)
-            line_num = content[:match.start()].count('\n') + 1
             attributes = extract_rust_attributes(content, match.start())
 
             export_info = {"name": name, "line": line_num, "kind": "enum"}
@@ -803,21 +1070,19 @@ def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
             exports.append(export_info)
 
     # Parse traits
-    for match in RUST_TRAIT_PATTERN.finditer(content):
-        name = match.group(1)
+    for match, base, line_num in items["trait"]:
+        name = match.group(base + 1).decode()
         if name not in seen_exports:
             seen_exports.add(name)
-            line_num = content[:match.start()].count('\n') + 1
             exports.append({"name": name, "line": line_num, "kind": "trait"})
 
     # Parse impl blocks
-    for match in RUST_IMPL_PATTERN_TRAIT_FOR.finditer(content):
-        trait_name = match.group(1)
-        type_name = match.group(2)
+    for match, base, line_num in items["impl_for"]:
+        trait_name = match.group(base + 1).decode()
+        type_name = match.group(base + 2).decode()
         impl_name = f"{trait_name}_for_{type_name}"
         if impl_name not in seen_exports:
             seen_exports.add(impl_name)
-            line_num = content[:match.start()].count('\n') + 1
             exports.append({
                 "name": impl_name,
                 "line": line_num,
@@ -826,18 +1091,16 @@ def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
                 "for": type_name
             })
 
-    for match in RUST_IMPL_PATTERN_TYPE.finditer(content):
-        type_name = match.group(1)
+    for match, base, line_num in items["impl"]:
+        type_name = match.group(base + 1).decode()
         impl_name = f"impl_{type_name}"
         if impl_name not in seen_exports:
             seen_exports.add(impl_name)
-            line_num = content[:match.start()].count('\n') + 1
             exports.append({"name": impl_name, "line": line_num, "kind": "impl"})
 
     # Parse use statements
-    for match in RUST_USE_PATTERN.finditer(content):
-        use_path = match.group(1)
-        line_num = content[:match.start()].count('\n') + 1
+    for match, base, line_num in items["use"]:
+        use_path = match.group(base + 1).decode('utf-8', 'replace')
         parts = use_path.split('::')
 
         imports.append({
@@ -847,21 +1110,19 @@ def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
         })
 
     # Parse mod declarations
-    for match in RUST_MOD_PATTERN.finditer(content):
-        name = match.group(1)
+    for match, base, line_num in items["mod"]:
+        name = match.group(base + 1).decode()
         mod_key = f"mod_{name}"
         if mod_key not in seen_exports:
             seen_exports.add(mod_key)
-            line_num = content[:match.start()].count('\n') + 1
             exports.append({"name": name, "line": line_num, "kind": "mod"})
 
     # Parse macro_rules!
-    for match in RUST_MACRO_RULES_PATTERN.finditer(content):
-        name = match.group(1)
+    for match, base, line_num in items["macro_rules"]:
+        name = match.group(base + 1).decode()
         macro_key = f"macro_{name}"
         if macro_key not in seen_functions:
             seen_functions.add(macro_key)
-            line_num = content[:match.start()].count('\n') + 1
             functions.append({
                 "name": f"{name}!",
                 "line_start": line_num,
@@ -869,12 +1130,11 @@ def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
             })
 
     # Parse macro 2.0
-    for match in RUST_MACRO_DECL_PATTERN.finditer(content):
-        name = match.group(1)
+    for match, base, line_num in items["macro"]:
+        name = match.group(base + 1).decode()
         macro_key = f"macro2_{name}"
         if macro_key not in seen_functions:
             seen_functions.add(macro_key)
-            line_num = content[:match.start()].count('\n') + 1
             functions.append({
                 "name": f"{name}!",
                 "line_start": line_num,
@@ -882,22 +1142,20 @@ def parse_rust(content: str, filepath: Path) -> Dict[str, Any]:
             })
 
     # Parse type aliases
-    for match in RUST_TYPE_ALIAS_PATTERN.finditer(content):
-        name = match.group(1)
+    for match, base, line_num in items["type"]:
+        name = match.group(base + 1).decode()
         if name not in seen_exports:
             seen_exports.add(name)
-            line_num = content[:match.start()].count('\n') + 1
             exports.append({"name": name, "line": line_num, "kind": "type"})
 
     # Parse const/static (only pub or SCREAMING_CASE)
-    for match in RUST_CONST_PATTERN.finditer(content):
-        kind = match.group(1)  # const or static
-        name = match.group(2)
+    for match, base, line_num in items["const"]:
+        kind = match.group(base + 1).decode()  # const or static
+        name = match.group(base + 2).decode()
         if name not in seen_exports:
             # Include if SCREAMING_CASE or in match context
             if name.isupper() or name.startswith('_'):
                 seen_exports.add(name)
-                line_num = content[:match.start()].count('\n') + 1
                 exports.append({"name": name, "line": line_num, "kind": kind})
 
     return {
@@ -926,20 +1184,22 @@ GENERIC_FUNCTION_PATTERNS = {
 }
 
 
-def parse_generic(content: str, filepath: Path, language: str) -> Dict[str, Any]:
+def parse_generic(content: str, filepath: str, language: str) -> Dict[str, Any]:
     """Generic parser for other languages (basic function detection)."""
     functions = []
 
     pattern = GENERIC_FUNCTION_PATTERNS.get(language)
     if pattern:
         seen = set()
+        line_num, counted = 1, 0  # Matches arrive in file order; count lines as we go
         for match in pattern.finditer(content):
             name = match.group(1)
             if name in seen:
                 continue
             seen.add(name)
 
-            line_num = content[:match.start()].count('\n') + 1
+            line_num += content[counted:match.start()].count('\n')
+            counted = match.start()
             functions.append({
                 "name": name,
                 "line_start": line_num,
@@ -949,14 +1209,246 @@ def parse_generic(content: str, filepath: Path, language: str) -> Dict[str, Any]
     return {"functions": functions, "imports": [], "exports": [], "calls": {}}
 
 
+# =============================================================================
+# PARSE CACHE
+# =============================================================================
+
+# Per-project cache of parser output, stored next to the scanned sources as a
+# SQLite table with one row per file, so a re-run only writes the rows that
+# changed. Results are stored as JSON text rather than pickle: the file sits
+# inside a repo that may not be trusted, and loading it must never execute code.
+#
+# Granularity is deliberately one entry per file. Splitting large files into
+# content-defined chunks and parsing them independently would change results:
+# block ends (line_end) run past chunk boundaries, multi-line matches can
+# straddle them, and names are deduplicated file-wide by first occurrence.
+CACHE_FILE = '.toonify-cache.sqlite'
+CACHE_VERSION = 2  # Bump whenever parser output changes (stored as PRAGMA user_version)
+
+# Compact encoder for cached results, built once rather than per json.dumps()
+# call. Parse results are trees of fresh dicts and lists, so the circular
+# reference check is skipped, and text goes to SQLite as UTF-8 unescaped.
+CACHE_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, check_circular=False)
+
+
+def load_cache(root: Path) -> Dict[str, Any]:
+    """Load cached parse results (rel_path -> entry); empty if missing or stale."""
+    path = root / CACHE_FILE
+    if sqlite3 is None or not path.exists():
+        return {}
+    try:
+        with closing(sqlite3.connect(str(path))) as conn:
+            if conn.execute('PRAGMA user_version').fetchone()[0] != CACHE_VERSION:
+                return {}
+            rows = conn.execute('SELECT path, mtime, size, result FROM files').fetchall()
+        return {
+            key: {"mtime": mtime, "size": size, "result": json.loads(result)}
+            for key, mtime, size, result in rows
+        }
+    except (sqlite3.Error, ValueError):
+        return {}
+
+
+def save_cache(root: Path, entries: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """
+    Bring the parse cache in line with entries. Failures (read-only trees) are ignored.
+
+    previous is what load_cache returned. Entries carried over from it
+    unchanged are not rewritten, and files no longer present are dropped.
+    """
+    if sqlite3 is None:
+        return
+    changed = [
+        (key, entry["mtime"], entry["size"], CACHE_ENCODER.encode(entry["result"]))
+        for key, entry in entries.items() if previous.get(key) is not entry
+    ]
+    removed = [(key,) for key in previous if key not in entries]
+    if not changed and not removed:
+        return
+
+    try:
+        with closing(sqlite3.connect(str(root / CACHE_FILE))) as conn:
+            with conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS files ('
+                    'path TEXT PRIMARY KEY, mtime INTEGER NOT NULL, '
+                    'size INTEGER NOT NULL, result TEXT NOT NULL)'
+                )
+                if conn.execute('PRAGMA user_version').fetchone()[0] != CACHE_VERSION:
+                    # Rows from another parser version were never loaded
+                    conn.execute('DELETE FROM files')
+                    conn.execute(f'PRAGMA user_version = {CACHE_VERSION}')
+                conn.executemany('DELETE FROM files WHERE path = ?', removed)
+                conn.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', changed)
+    except sqlite3.Error:
+        pass
+
+
 # =============================================================================
 # INDEX BUILDER
 # =============================================================================
 
-def build_index(root: Path) -> Dict[str, Any]:
+# Files at least this large are memory-mapped rather than read
+MMAP_MIN_SIZE = 256 * 1024
+
+# Below this many files to parse, starting a process pool costs more than it saves
+PARALLEL_MIN_FILES = 50
+
+# Parsers that scan the raw file bytes; every other language is decoded first
+# and goes to parse_python or parse_generic
+BYTES_PARSERS = {
+    'javascript': parse_js_ts,
+    'typescript': parse_js_ts,
+    'rust': parse_rust,
+}
+
+# Only the bytes-based parsers can scan an mmap directly
+MMAP_LANGUAGES = frozenset(BYTES_PARSERS)
+
+
+def count_lines(data) -> int:
+    """Line count of a bytes-like buffer. mmap has no .count(), so scan it in chunks."""
+    if isinstance(data, bytes):
+        return data.count(b'\n') + 1
+    chunk = 1 << 20
+    return sum(data[i:i + chunk].count(b'\n') for i in range(0, len(data), chunk)) + 1
+
+
+def _parse_data(data, filepath: str, language: str) -> Dict[str, Any]:
+    """Parse raw file bytes (or an mmap of them) for one file."""
+    bytes_parser = BYTES_PARSERS.get(language)
+    if bytes_parser is not None:
+        parsed = bytes_parser(data, filepath)
+    else:
+        content = data.decode('utf-8', errors='replace')
+        if language == 'python':
+            parsed = parse_python(content, filepath)
+        else:
+            parsed = parse_generic(content, filepath, language)
+
+    return {
+        "language": language,
+        "hash": get_file_hash(data),
+        "lines": count_lines(data),
+        "parsed": parsed,
+    }
+
+
+def _parse_one(filepath: str) -> Optional[Dict[str, Any]]:
+    """Read and parse one file. Runs inside worker processes."""
+    language = LANG_MAP.get(file_extension(filepath), 'unknown')
+
+    try:
+        with open(filepath, 'rb') as f:
+            if language in MMAP_LANGUAGES and os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+                # Large bundles and generated sources page in on demand instead
+                # of being copied into memory
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return _parse_data(mapped, filepath, language)
+            data = f.read()
+    except OSError:
+        return None
+
+    return _parse_data(data, filepath, language)
+
+
+def _hash_one(filepath: str) -> Optional[str]:
+    """Hash one file's current contents. Runs in a thread; hashlib drops the GIL."""
+    try:
+        with open(filepath, 'rb') as f:
+            return get_file_hash(f.read())
+    except OSError:
+        return None
+
+
+def _run_jobs(jobs: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Run _parse_one over jobs in parallel across CPU cores, preserving order."""
+    if len(jobs) < PARALLEL_MIN_FILES:
+        return [_parse_one(job) for job in jobs]
+
+    # ~4 chunks per worker amortizes IPC without starving the pool at the tail
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (4 * workers))
+
+    try:
+        executor = ProcessPoolExecutor()
+    except (ImportError, NotImplementedError, OSError):
+        # No working multiprocessing on this platform - parse in-process
+        return [_parse_one(job) for job in jobs]
+
+    with executor:
+        return list(executor.map(_parse_one, jobs, chunksize=chunksize))
+
+
+def parse_files(files: List[str], keys: List[str],
+                cache: Dict[str, Any]) -> Tuple[List[Optional[Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Parse files, reusing cached results where possible.
+
+    cache maps keys[i] -> {"mtime", "size", "result"} from a previous run.
+    Files with unchanged size and mtime are served without being read.
+    Touched files of the same size are re-hashed on a thread pool first, so
+    only content that really changed is sent to the parser processes.
+    Returns results in input order plus the cache entries for this run.
+    """
+    results = [None] * len(files)
+    entries = {}
+    touched = []  # (index, stat) - same size, new mtime
+    pending = []  # (index, stat)
+    jobs = []
+
+    for i, (filepath, key) in enumerate(zip(files, keys)):
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            continue
+        cached = cache.get(key)
+        if cached and cached["mtime"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            results[i] = cached["result"]
+            entries[key] = cached
+        elif cached and cached["size"] == st.st_size:
+            touched.append((i, st))
+        else:
+            pending.append((i, st))
+            jobs.append(filepath)
+
+    if touched:
+        # Reading and hashing overlap across threads; no process start-up or
+        # pickling is paid for files that were only touched (checkouts, builds)
+        with ThreadPoolExecutor() as executor:
+            digests = executor.map(_hash_one, [files[i] for i, _ in touched])
+            for (i, st), digest in zip(touched, digests):
+                key = keys[i]
+                cached = cache[key]
+                if digest is not None and digest == cached["result"]["hash"]:
+                    results[i] = cached["result"]
+                    entries[key] = {"mtime": st.st_mtime_ns, "size": st.st_size,
+                                    "result": cached["result"]}
+                else:
+                    pending.append((i, st))
+                    jobs.append(files[i])
+
+    for (i, st), result in zip(pending, _run_jobs(jobs)):
+        if result is None:
+            continue
+        key = keys[i]
+        results[i] = result
+        entries[key] = {"mtime": st.st_mtime_ns, "size": st.st_size, "result": result}
+
+    return results, entries
+
+
+def build_index(root: Path, use_cache: bool = True) -> Dict[str, Any]:
     """Build a complete codebase index."""
     root = root.resolve()
     files = discover_files(root)
+    prefix_len = len(os.path.join(str(root), ''))
+    rel_paths = [filepath[prefix_len:].replace('\\', '/') for filepath in files]
+
+    cache = load_cache(root) if use_cache else {}
+    results, cache_entries = parse_files(files, rel_paths, cache)
+    if use_cache:
+        save_cache(root, cache_entries, cache)
 
     file_data = {}
     all_functions = {}
@@ -965,39 +1457,31 @@ def build_index(root: Path) -> Dict[str, Any]:
     all_calls = {}  # Global call graph
     language_counts = {}
 
-    for filepath in files:
-        try:
-            content = filepath.read_text(encoding='utf-8', errors='replace')
-        except Exception:
+    # Parse results arrive unpickled from workers or decoded from the cache,
+    # so every language, kind, module and call name is a fresh copy. Interning
+    # them as they enter the index keeps one object per distinct string
+    intern = sys.intern
+
+    for rel_path, result in zip(rel_paths, results):
+        if result is None:
             continue
 
-        rel_path = str(filepath.relative_to(root)).replace('\\', '/')
-        ext = filepath.suffix.lower()
-        language = LANG_MAP.get(ext, 'unknown')
+        language = intern(result["language"])
+        parsed = result["parsed"]
 
         # Count languages
         language_counts[language] = language_counts.get(language, 0) + 1
 
-        # Parse based on language
-        if language == 'python':
-            parsed = parse_python(content, filepath)
-        elif language in ('javascript', 'typescript'):
-            parsed = parse_js_ts(content, filepath)
-        elif language == 'rust':
-            parsed = parse_rust(content, filepath)
-        else:
-            parsed = parse_generic(content, filepath, language)
-
-        lines = content.count('\n') + 1
-
         file_data[rel_path] = {
             "path": rel_path,
             "language": language,
-            "hash": get_file_hash(content),
-            "lines": lines,
+            "hash": result["hash"],
+            "lines": result["lines"],
         }
 
-        # Store functions
+        # Store functions. Entries stay plain dicts: the index is returned from
+        # toonify() and JSON-serialised as-is, and optional keys (doc, attrs,
+        # decorators) are only present when the parser found them
         for func in parsed["functions"]:
             key = f"{rel_path}:{func['name']}"
             func_entry = {
@@ -1022,7 +1506,7 @@ def build_index(root: Path) -> Dict[str, Any]:
         for func_name, calls in parsed.get("calls", {}).items():
             key = f"{rel_path}:{func_name}"
             if key in all_functions:
-                all_functions[key]["calls"] = calls
+                all_functions[key]["calls"] = list(map(intern, calls))
 
         # Store exports
         for exp in parsed.get("exports", []):
@@ -1031,7 +1515,7 @@ def build_index(root: Path) -> Dict[str, Any]:
                 "file": rel_path,
                 "name": exp["name"],
                 "line": exp.get("line", 0),
-                "kind": exp.get("kind", "export"),
+                "kind": intern(exp.get("kind", "export")),
             }
             # Add optional fields
             for field in ["bases", "extends", "decorators", "attrs", "doc", "trait", "for"]:
@@ -1044,8 +1528,8 @@ def build_index(root: Path) -> Dict[str, Any]:
         for imp in parsed["imports"]:
             all_edges.append({
                 "from_file": rel_path,
-                "to_file": imp.get("module", ""),
-                "names": [imp.get("name", "")],
+                "to_file": intern(imp.get("module", "")),
+                "names": [intern(imp.get("name", ""))],
                 "line": imp.get("line", 0),
             })
 
@@ -1073,28 +1557,39 @@ def build_index(root: Path) -> Dict[str, Any]:
 # TOON ENCODER
 # =============================================================================
 
+def _encode_cell(val: Any) -> str:
+    """Render one table value: lists join with ';', None is empty."""
+    if isinstance(val, list):
+        return ";".join(str(v) for v in val)
+    if val is None:
+        return ""
+    return str(val)
+
+
 def encode_table(name: str, items: List[Dict], fields: List[str]) -> str:
     """Encode list of dicts as TOON table."""
-    if not items:
-        return f"{name}[0]{{{','.join(fields)}}}\n"
-
     lines = [f"{name}[{len(items)}]{{{','.join(fields)}}}"]
 
-    for item in items:
-        values = []
-        for field in fields:
-            val = item.get(field, "")
-            if isinstance(val, list):
-                val = ";".join(str(v) for v in val) if val else ""
-            elif val is None:
-                val = ""
-            else:
-                val = str(val)
-            val = val.replace("|", "\\|")
-            values.append(val)
-        lines.append("|".join(values))
-
-    return "\n".join(lines) + "\n"
+    # Build the table a column at a time: each column's values usually share
+    # one type, so most columns convert with a single map() call. Gathering
+    # goes through map(dict.get, ...) too, keeping the per-row work in C
+    columns = []
+    for field in fields:
+        column = list(map(dict.get, items, repeat(field), repeat("")))
+        kinds = set(map(type, column))
+        if kinds == {list}:
+            column = [";".join(map(str, val)) if val else "" for val in column]
+        elif not kinds <= {str, int}:
+            column = list(map(_encode_cell, column))
+        elif int in kinds:
+            column = list(map(str, column))
+        if "|" in "".join(column):
+            column = [val.replace("|", "\\|") for val in column]
+        columns.append(column)
+
+    lines.extend(map("|".join, zip(*columns)))
+    lines.append("")
+    return "\n".join(lines)
 
 
 def encode_metadata(metadata: Dict[str, Any]) -> str:
@@ -1112,46 +1607,66 @@ def encode_metadata(metadata: Dict[str, Any]) -> str:
     return "\n".join(lines) + "\n"
 
 
-def encode_index(index_data: Dict[str, Any]) -> str:
-    """Encode full index to TOON format."""
-    sections = []
-
+def iter_sections(index_data: Dict[str, Any]) -> Iterator[str]:
+    """Yield the TOON sections of an index one at a time, in output order."""
     if "metadata" in index_data:
-        sections.append(encode_metadata(index_data["metadata"]))
+        yield encode_metadata(index_data["metadata"])
 
     if "files" in index_data:
         files_list = list(index_data["files"].values())
-        sections.append(encode_table("files", files_list, ["path", "language", "hash", "lines"]))
+        yield encode_table("files", files_list, ["path", "language", "hash", "lines"])
 
     if "graph" in index_data and "edges" in index_data["graph"]:
-        sections.append(encode_table("edges", index_data["graph"]["edges"],
-                                     ["from_file", "to_file", "names", "line"]))
+        yield encode_table("edges", index_data["graph"]["edges"],
+                           ["from_file", "to_file", "names", "line"])
 
     if "functions" in index_data:
         funcs_list = list(index_data["functions"].values())
         # Include calls in the output for RAG-friendliness
-        sections.append(encode_table("functions", funcs_list,
-                                     ["file", "name", "line_start", "line_end", "calls", "called_by"]))
+        yield encode_table("functions", funcs_list,
+                           ["file", "name", "line_start", "line_end", "calls", "called_by"])
 
     if "exports" in index_data and index_data["exports"]:
         exports_list = list(index_data["exports"].values())
-        sections.append(encode_table("exports", exports_list,
-                                     ["file", "name", "line", "kind"]))
+        yield encode_table("exports", exports_list,
+                           ["file", "name", "line", "kind"])
+
+
+def encode_index(index_data: Dict[str, Any]) -> str:
+    """Encode full index to TOON format."""
+    return "\n".join(iter_sections(index_data))
 
-    return "\n".join(sections)
+
+def write_index(index_data: Dict[str, Any], path: Path) -> int:
+    """
+    Write the TOON encoding of an index to path, one section at a time.
+
+    Produces the same text as encode_index without holding all of it in
+    memory. Returns the UTF-8 size in bytes.
+    """
+    size = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, section in enumerate(iter_sections(index_data)):
+            if i:
+                f.write("\n")
+                size += 1
+            f.write(section)
+            size += len(section.encode('utf-8'))
+    return size
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def toonify(directory: Path, output: Optional[Path] = None) -> Dict[str, Any]:
+def toonify(directory: Path, output: Optional[Path] = None, use_cache: bool = True) -> Dict[str, Any]:
     """
     Generate TOON file for a codebase.
 
     Args:
         directory: Project root directory
         output: Output file path (default: directory/<name>.toon)
+        use_cache: Reuse parse results for unchanged files from directory/.toonify-cache.sqlite
 
     Returns:
         Stats dict with sizes and savings
@@ -1163,24 +1678,19 @@ def toonify(directory: Path, output: Optional[Path] = None) -> Dict[str, Any]:
 
     # Build index
     print(f"Scanning: {directory}")
-    index = build_index(directory)
-
-    # Encode to TOON
-    toon_content = encode_index(index)
-
-    # Also create JSON for comparison
-    json_content = json.dumps(index, indent=2)
+    index = build_index(directory, use_cache)
 
     # Determine output path
     if output is None:
         output = directory / f"{directory.name}.toon"
     output = Path(output).resolve()
 
-    # Write TOON
-    output.write_text(toon_content, encoding='utf-8')
+    # Encode and write TOON
+    toon_size = write_index(index, output)
 
-    json_size = len(json_content.encode('utf-8'))
-    toon_size = len(toon_content.encode('utf-8'))
+    # Size the equivalent pretty-printed JSON for comparison. Stream it rather
+    # than building the whole document; ensure_ascii output has one byte per char
+    json_size = sum(map(len, json.JSONEncoder(indent=2).iterencode(index)))
     savings = ((json_size - toon_size) / json_size * 100) if json_size > 0 else 0
 
     return {
@@ -1232,13 +1742,16 @@ FUTURE VISION:
                         help="Project directory (default: current)")
     parser.add_argument("-o", "--output",
                         help="Output .toon file path")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Re-parse every file and skip reading/writing {CACHE_FILE}")
 
     args = parser.parse_args()
 
     try:
         stats = toonify(
             Path(args.directory),
-            Path(args.output) if args.output else None
+            Path(args.output) if args.output else None,
+            use_cache=not args.no_cache,
         )
 
         # Format language output
@@ -0,0 +1,68 @@
+"""
+Agentic RAG - Response Caches
+Small in-process LRU caches with a time-to-live, for read endpoints that
+would otherwise hit the vector store on every UI refresh.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """LRU cache whose entries also expire ttl seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        self._entries.pop(key, None)
+
+    def pop_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every entry whose key satisfies predicate."""
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+# The caches are only touched from the event loop thread, so they need no
+# lock. Reads may await between a lookup and a store, so the document caches
+# are keyed on the vector store's collection version, read before the await:
+# any write (upload, /ingest, delete) moves readers to a new key, and a read
+# that raced the write stores its result under the old one. Routes that
+# write also drop the collection's entries to free them early. The
+# collection listing is only cleared by the API routes; other changes show
+# up once its TTL runs out.
+
+# Collection listing (single key)
+collections_cache = TTLCache(maxsize=1, ttl=10)
+
+# (collection name, version) -> DocumentListResponse
+documents_cache = TTLCache(maxsize=512, ttl=10)
+
+# (collection name, doc_id, max_chars, version) -> DocumentPreviewResponse
+preview_cache = TTLCache(maxsize=512, ttl=300)
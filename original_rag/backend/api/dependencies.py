@@ -0,0 +1,21 @@
+"""
+Agentic RAG - Route Dependencies
+Providers for the shared singletons built once in api.main.lifespan.
+"""
+from fastapi import HTTPException, Request
+
+from rag.pipeline import RAGPipeline
+from vectorstore.store import ChromaVectorStore
+
+
+def get_pipeline(request: Request) -> RAGPipeline:
+    """The RAG pipeline built at startup."""
+    pipeline = request.app.state.pipeline
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="RAG pipeline is not available")
+    return pipeline
+
+
+def get_vector_store(request: Request) -> ChromaVectorStore:
+    """The vector store built at startup."""
+    return request.app.state.vector_store
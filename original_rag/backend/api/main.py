@@ -4,75 +4,26 @@ Main entry point for the API server.
 """
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
-from datetime import datetime
-from collections import defaultdict
-from typing import Dict
+import orjson
+from datetime import datetime, timezone
 
 from config.settings import settings
+from api.metrics import metrics
 from api.routes import chat_router, ingest_router, collections_router
 from api.models import HealthResponse, ErrorResponse
 
 
-# === Lightweight Metrics ===
-class SimpleMetrics:
-    """Non-invasive request metrics for observability."""
-
-    def __init__(self):
-        self.request_count: Dict[str, int] = defaultdict(int)
-        self.error_count: Dict[str, int] = defaultdict(int)
-        self.latency_sum: Dict[str, float] = defaultdict(float)
-        self.latency_count: Dict[str, int] = defaultdict(int)
-        self.started_at = datetime.utcnow()
-
-    def record_request(self, path: str, latency_ms: float, is_error: bool = False):
-        """Record a request metric."""
-        # Normalize path (remove IDs for grouping)
-        normalized = self._normalize_path(path)
-        self.request_count[normalized] += 1
-        self.latency_sum[normalized] += latency_ms
-        self.latency_count[normalized] += 1
-        if is_error:
-            self.error_count[normalized] += 1
-
-    def _normalize_path(self, path: str) -> str:
-        """Normalize path by replacing IDs with placeholders."""
-        parts = path.strip('/').split('/')
-        normalized = []
-        for part in parts:
-            # Replace UUIDs and long alphanumeric IDs
-            if len(part) > 10 and part.replace('-', '').isalnum():
-                normalized.append('{id}')
-            else:
-                normalized.append(part)
-        return '/' + '/'.join(normalized) if normalized else '/'
-
-    def get_summary(self) -> dict:
-        """Get metrics summary."""
-        uptime = (datetime.utcnow() - self.started_at).total_seconds()
-        endpoints = {}
-        for path in self.request_count:
-            count = self.request_count[path]
-            avg_latency = self.latency_sum[path] / self.latency_count[path] if self.latency_count[path] > 0 else 0
-            endpoints[path] = {
-                "requests": count,
-                "errors": self.error_count[path],
-                "avg_latency_ms": round(avg_latency, 2),
-            }
-        return {
-            "uptime_seconds": round(uptime, 1),
-            "total_requests": sum(self.request_count.values()),
-            "total_errors": sum(self.error_count.values()),
-            "endpoints": endpoints,
-        }
-
-
-metrics = SimpleMetrics()
-
-# Configure logging
+# Configure logging. The format uses none of the thread/process fields, so
+# skip collecting them for every record.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 logging.basicConfig(
     level=logging.DEBUG if settings.debug else logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -90,10 +41,40 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     settings.ensure_directories()
 
+    # Shared HTTP client: health probes reuse its pooled keep-alive
+    # connections instead of opening a new client per request
+    import httpx
+    app.state.http = httpx.AsyncClient(
+        timeout=2.0,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+
+    # Build the vector store and pipeline once, before serving, rather than
+    # lazily (and unlocked) on the first request. Routes get them through
+    # api.dependencies; the pipeline shares the store's embedding model.
+    from rag.pipeline import RAGPipeline
+    from vectorstore.store import get_default_store
+    app.state.vector_store = get_default_store()
+    try:
+        app.state.pipeline = RAGPipeline(vectorstore=app.state.vector_store)
+        logger.info("RAG pipeline initialized")
+    except Exception as e:
+        logger.error(f"RAG pipeline initialization failed: {e}")
+        app.state.pipeline = None
+
+    # The local ONNX model sets up its session on first use; pay that here
+    # instead of on the first query
+    if settings.embedding_provider == "fastembed":
+        try:
+            await asyncio.to_thread(app.state.vector_store.embeddings.embed_query, "warmup")
+        except Exception as e:
+            logger.warning(f"Embedding warmup failed: {e}")
+
     yield
 
     # Shutdown - close connections
     logger.info("Shutting down...")
+    await app.state.http.aclose()
     try:
         from memory.store import MemoryStore
         await MemoryStore.close()
@@ -107,8 +88,11 @@ app = FastAPI(
     version=settings.app_version,
     description="Self-correcting RAG with RAGAS evaluation",
     lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    # Without docs the OpenAPI schema (examples included) is never built
+    docs_url="/docs" if settings.enable_docs else None,
+    redoc_url="/redoc" if settings.enable_docs else None,
+    openapi_url="/openapi.json" if settings.enable_docs else None,
 )
 
 # CORS middleware
@@ -121,78 +105,134 @@ app.add_middleware(
 )
 
 
+# Compression middleware
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """
+    Gzip JSON responses, leaving the SSE chat streams alone.
+
+    The gzip writer holds data until it has enough to emit a block, which
+    would delay each token event, so /stream routes bypass compression.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(NonStreamingGZipMiddleware, minimum_size=1000, compresslevel=5)
+
+
 # Metrics middleware
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    """Track request metrics without impacting performance."""
-    start_time = time.time()
-    response = await call_next(request)
-    latency_ms = (time.time() - start_time) * 1000
+class MetricsMiddleware:
+    """
+    Track request metrics without impacting performance.
+
+    Pure ASGI rather than @app.middleware("http"): BaseHTTPMiddleware builds
+    Request/Response wrappers and runs the endpoint in an extra task on every
+    call, while this only watches the response start message for the status.
+    """
+
+    def __init__(self, app):
+        self.app = app
 
-    # Skip metrics endpoint to avoid recursion
-    if request.url.path != "/metrics":
-        is_error = response.status_code >= 400
-        metrics.record_request(request.url.path, latency_ms, is_error)
+    async def __call__(self, scope, receive, send):
+        # Skip non-HTTP traffic and the metrics endpoints to avoid recursion
+        if scope["type"] != "http" or scope["path"].startswith("/metrics"):
+            await self.app(scope, receive, send)
+            return
 
-    return response
+        start_time = time.perf_counter()
 
+        async def send_wrapper(message):
+            # Latency runs to the response headers, as with call_next(), so
+            # streaming endpoints are not timed to the end of their stream
+            if message["type"] == "http.response.start":
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                metrics.record_request(scope["path"], latency_ms, message["status"] >= 400)
+            await send(message)
 
-# Global exception handler
+        await self.app(scope, receive, send_wrapper)
+
+
+app.add_middleware(MetricsMiddleware)
+
+
+# Global exception handler. Starlette installs a handler for Exception as
+# the handler of its outermost ServerErrorMiddleware, so it costs nothing on
+# successful requests and only runs once a 500 is being produced.
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error="Internal server error",
             code="INTERNAL_ERROR",
             details={"message": str(exc)} if settings.debug else None,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
         ).model_dump(mode="json")
     )
 
 
-# Health check
-@app.get("/health", response_model=HealthResponse, tags=["System"])
-async def health_check():
-    """
-    Health check endpoint.
-    Returns status of all services.
-    """
-    services = {"api": True}
-
-    # Check vector store
+# Health check probes. Each returns whether its service is usable and logs
+# (rather than raises) any failure, so one broken service cannot cancel the
+# other probes in the TaskGroup.
+async def _check_vector_store(app: FastAPI) -> bool:
     try:
-        from vectorstore.store import VectorStore
-        vs = VectorStore()
-        # Simple check - can we access the store?
-        services["vector_store"] = vs._store is not None or True  # Lazy init is ok
+        # Probe the lifespan-built store rather than building another one
+        # (and loading another embedding model); the Chroma call itself is
+        # blocking, so it runs in a worker thread
+        await asyncio.to_thread(app.state.vector_store.ping)
+        return True
     except Exception as e:
         logger.warning(f"Vector store health check failed: {e}")
-        services["vector_store"] = False
+        return False
+
 
-    # Check LLM availability
+async def _check_llm(app: FastAPI) -> bool:
     try:
         if settings.llm_provider == "ollama":
-            import httpx
-            async with httpx.AsyncClient(timeout=2.0) as client:
-                resp = await client.get(f"{settings.ollama_base_url}/api/tags")
-                services["llm"] = resp.status_code == 200
-        else:
-            services["llm"] = True  # Assume cloud LLMs are available
+            resp = await app.state.http.get(f"{settings.ollama_base_url}/api/tags")
+            return resp.status_code == 200
+        return True  # Assume cloud LLMs are available
     except Exception as e:
         logger.warning(f"LLM health check failed: {e}")
-        services["llm"] = False
+        return False
+
 
-    # Check memory backend
+async def _check_memory() -> bool:
     try:
         from memory.store import memory_store
         # Quick test - list sessions (fast operation)
         await memory_store.list_sessions()
-        services["memory"] = True
+        return True
     except Exception as e:
         logger.warning(f"Memory health check failed: {e}")
-        services["memory"] = False
+        return False
+
+
+@app.get("/health", response_model=HealthResponse, tags=["System"])
+async def health_check(request: Request):
+    """
+    Health check endpoint.
+    Returns status of all services.
+
+    The probes run concurrently, so the check takes as long as the slowest
+    one rather than their sum.
+    """
+    async with asyncio.TaskGroup() as tg:
+        vector_store = tg.create_task(_check_vector_store(request.app))
+        llm = tg.create_task(_check_llm(request.app))
+        memory = tg.create_task(_check_memory())
+
+    services = {
+        "api": True,
+        "vector_store": vector_store.result(),
+        "llm": llm.result(),
+        "memory": memory.result(),
+    }
 
     all_healthy = all(services.values())
 
@@ -209,29 +249,44 @@ app.include_router(ingest_router)
 app.include_router(collections_router)
 
 
-# Root endpoint
+# Root endpoint. Its body depends only on settings read at startup, so it
+# is serialized once here rather than on every request.
+ROOT_BODY = orjson.dumps({
+    "name": settings.app_name,
+    "version": settings.app_version,
+    "docs": "/docs" if settings.enable_docs else None,
+    "health": "/health",
+    "metrics": "/metrics",
+})
+
+
 @app.get("/", tags=["System"])
 async def root():
     """
     Root endpoint with API information.
     """
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "docs": "/docs",
-        "health": "/health",
-        "metrics": "/metrics",
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 # Metrics endpoint
-@app.get("/metrics", tags=["System"])
+@app.get("/metrics", response_class=ORJSONResponse, tags=["System"])
 async def get_metrics():
     """
     Lightweight metrics for observability.
     Returns request counts, error rates, and latencies per endpoint.
+
+    Returned as a response object so FastAPI does not walk the per-endpoint
+    dict through jsonable_encoder before serializing it.
+    """
+    return ORJSONResponse(metrics.get_summary())
+
+
+@app.get("/metrics/prometheus", response_class=Response, tags=["System"])
+async def get_prometheus_metrics():
+    """
+    The same counters in Prometheus text format, for scrapers.
     """
-    return metrics.get_summary()
+    return Response(content=metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
@@ -241,4 +296,10 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        # uvicorn[standard] ships uvloop (not on Windows, where "auto" falls
+        # back to asyncio) and the C httptools parser; require the latter
+        loop="auto",
+        http="httptools",
+        access_log=settings.debug,
+        proxy_headers=False,
     )
@@ -0,0 +1,87 @@
+"""
+Agentic RAG - Request Metrics
+Lightweight per-endpoint counters, recorded by the API middleware.
+"""
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List
+
+
+# A whole path segment longer than 10 chars made of letters, digits and
+# hyphens (with at least one letter or digit): UUIDs and generated IDs
+ID_SEGMENT_PATTERN = re.compile(r"(?<![^/])(?![^/]*_)(?=[^/]*[^\W_])[-\w]{11,}(?![^/])")
+
+# Slots of the per-endpoint counter lists
+REQUESTS, ERRORS, LATENCY_SUM = 0, 1, 2
+
+# (metric name, counter slot) series exposed by render_prometheus
+PROMETHEUS_COUNTERS = [
+    (b"http_requests_total", REQUESTS),
+    (b"http_request_errors_total", ERRORS),
+    (b"http_request_duration_milliseconds_total", LATENCY_SUM),
+]
+
+
+class SimpleMetrics:
+    """Non-invasive request metrics for observability."""
+
+    def __init__(self) -> None:
+        # normalized path -> [requests, errors, latency_sum_ms]. Each request
+        # does one dict lookup and bumps slots in place, instead of updating
+        # a separate dict per counter.
+        self.endpoints: Dict[str, List[float]] = {}
+        self.started_at = time.monotonic()
+
+    def record_request(self, path: str, latency_ms: float, is_error: bool = False) -> None:
+        """Record a request metric."""
+        # Normalize path (remove IDs for grouping)
+        normalized = self._normalize_path(path)
+        counters = self.endpoints.get(normalized)
+        if counters is None:
+            counters = self.endpoints[normalized] = [0, 0, 0.0]
+        counters[REQUESTS] += 1
+        counters[LATENCY_SUM] += latency_ms
+        if is_error:
+            counters[ERRORS] += 1
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _normalize_path(path: str) -> str:
+        """Normalize path by replacing IDs with placeholders (cached per raw path)."""
+        return '/' + ID_SEGMENT_PATTERN.sub('{id}', path.strip('/'))
+
+    def get_summary(self) -> dict:
+        """Get metrics summary."""
+        uptime = time.monotonic() - self.started_at
+        endpoints = {
+            path: {
+                "requests": requests,
+                "errors": errors,
+                "avg_latency_ms": round(latency_sum / requests, 2) if requests else 0,
+            }
+            for path, (requests, errors, latency_sum) in self.endpoints.items()
+        }
+        return {
+            "uptime_seconds": round(uptime, 1),
+            "total_requests": sum(stats["requests"] for stats in endpoints.values()),
+            "total_errors": sum(stats["errors"] for stats in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+    def render_prometheus(self) -> bytes:
+        """Render the counters in the Prometheus text exposition format."""
+        labels = [
+            (path.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").encode(), counters)
+            for path, counters in self.endpoints.items()
+        ]
+        buf = bytearray(b"# TYPE app_uptime_seconds gauge\n")
+        buf += b"app_uptime_seconds %.1f\n" % (time.monotonic() - self.started_at)
+        for name, slot in PROMETHEUS_COUNTERS:
+            buf += b"# TYPE %s counter\n" % name
+            for label, counters in labels:
+                buf += b'%s{path="%s"} %r\n' % (name, label, counters[slot])
+        return bytes(buf)
+
+
+metrics = SimpleMetrics()
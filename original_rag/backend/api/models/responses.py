@@ -4,7 +4,7 @@ Pydantic models for API responses.
 """
 from pydantic import BaseModel, Field
 from typing import Optional, Literal
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 # === Common ===
@@ -217,4 +217,4 @@ class ErrorResponse(BaseModel):
     error: str
     code: str
     details: Optional[dict] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
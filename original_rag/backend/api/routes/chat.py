@@ -3,18 +3,22 @@ Chat Routes
 Handles chat interactions with streaming support.
 Includes chat-scoped document management per ADR-007.
 """
-import json
+import asyncio
 import uuid
 import logging
-import tempfile
 import os
-from datetime import datetime
-from pathlib import Path
-from typing import AsyncGenerator, List
-
-from fastapi import APIRouter, HTTPException, UploadFile, File
+import time
+from functools import lru_cache
+from typing import AsyncGenerator, AsyncIterator, List
+
+import aiofiles.os
+import aiofiles.tempfile
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sse_starlette.sse import EventSourceResponse
 
+from api.cache import collections_cache, documents_cache, preview_cache
+from api.dependencies import get_pipeline, get_vector_store
 from api.models import (
     ChatRequest,
     ChatResponse,
@@ -35,31 +39,70 @@ from api.models import (
 from config.settings import settings
 from rag.pipeline import RAGPipeline
 from memory import memory_store
-from vectorstore.store import VectorStore
+from vectorstore.store import ChromaVectorStore
 from ingest.service import ingestion_service
 
 logger = logging.getLogger(__name__)
 
 # Supported file types for chat documents
-SUPPORTED_FILE_TYPES = {'.pdf', '.txt', '.md', '.docx'}
+SUPPORTED_FILE_TYPES = frozenset({'.pdf', '.txt', '.md', '.docx'})
+
+# Uploads are copied to temp files in chunks of this size, never whole
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Pipeline events the stream producer may run ahead of a slow client
+STREAM_BUFFER_SIZE = 128
+
+# Seconds a single SSE send may block before the client is dropped
+SSE_SEND_TIMEOUT = 30
+
+# Marks the end of a buffered stream
+_STREAM_END = object()
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
-# Lazy-initialized pipeline instance
-_pipeline: RAGPipeline | None = None
 
+def encode_event(payload: dict) -> str:
+    """Serialize one SSE event payload (called per token, so via orjson)."""
+    return orjson.dumps(payload).decode()
+
+
+# Pre-encoded phase events for the phases RAGPipeline.astream emits
+PHASE_EVENTS = {
+    phase: encode_event({'type': 'phase', 'phase': phase})
+    for phase in ("searching", "generating")
+}
 
-def get_pipeline() -> RAGPipeline:
-    """Get or create the RAG pipeline instance."""
-    global _pipeline
-    if _pipeline is None:
-        logger.info("Initializing RAG pipeline...")
-        _pipeline = RAGPipeline()
-        logger.info("RAG pipeline initialized")
-    return _pipeline
+
+async def buffered(source: AsyncIterator[dict], maxsize: int = STREAM_BUFFER_SIZE) -> AsyncGenerator[dict, None]:
+    """
+    Re-yield source's items, iterating it in its own task through a bounded
+    queue: the pipeline keeps generating while a send to the client is
+    blocked, up to maxsize events ahead. Errors from source are re-raised
+    here, and stopping early cancels the producer.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def produce():
+        try:
+            async for item in source:
+                await queue.put(item)
+            await queue.put(_STREAM_END)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (item := await queue.get()) is not _STREAM_END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
 
 
 async def generate_stream(
+    pipeline: RAGPipeline,
     message: str,
     session_id: str,
     collection_name: str | None,
@@ -79,7 +122,7 @@ async def generate_stream(
     If chat_id is provided, uses chat-scoped collection (chat_{chat_id}).
     Otherwise falls back to collection_name for backward compatibility.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     message_id = str(uuid.uuid4())
 
     # Determine collection: chat-scoped takes priority
@@ -88,91 +131,93 @@ async def generate_stream(
     logger.info(f"Starting TRUE STREAMING for message in collection: {effective_collection}")
 
     try:
-        pipeline = get_pipeline()
+        # Reused for every token: only content changes, and each event is
+        # encoded before the next one is built
+        token_event = {'type': 'token', 'content': ''}
 
         # Stream through the pipeline with TRUE real-time events
-        async for chunk in pipeline.astream(message, session_id, effective_collection):
+        async for chunk in buffered(pipeline.astream(message, session_id, effective_collection)):
             event_type = chunk.get("type")
 
             if event_type == "phase":
                 # Phase change event - for frontend progress indicator
                 phase = chunk.get("phase", "searching")
-                yield json.dumps({'type': 'phase', 'phase': phase})
+                event = PHASE_EVENTS.get(phase)
+                yield event or encode_event({'type': 'phase', 'phase': phase})
                 logger.debug(f"SSE phase: {phase}")
 
             elif event_type == "token":
                 # TRUE streaming token - yield immediately
-                yield json.dumps({'type': 'token', 'content': chunk['content']})
+                token_event['content'] = chunk['content']
+                yield encode_event(token_event)
 
             elif event_type == "sources":
                 # Sources found - emitted BEFORE generation starts
-                sources = []
-                for s in chunk.get("sources", []):
-                    if isinstance(s, dict):
-                        sources.append({
-                            "filename": s.get("filename", s.get("source", "unknown")),
-                            "chunk_id": s.get("chunk_id", ""),
-                            "relevance_score": s.get("relevance_score", 0.0),
-                            "content_preview": s.get("content_preview", s.get("page_content", "")[:200]),
-                            "page": s.get("page"),
-                        })
-                yield json.dumps({'type': 'sources', 'sources': sources})
+                sources = [
+                    {
+                        "filename": s.get("filename", s.get("source", "unknown")),
+                        "chunk_id": s.get("chunk_id", ""),
+                        "relevance_score": s.get("relevance_score", 0.0),
+                        "content_preview": s.get("content_preview", s.get("page_content", "")[:200]),
+                        "page": s.get("page"),
+                    }
+                    for s in chunk.get("sources") or ()
+                ]
+                yield encode_event({'type': 'sources', 'sources': sources})
                 logger.info(f"SSE sources: {len(sources)} documents")
 
             elif event_type == "done":
                 # Stream complete
-                processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
                 done = StreamDone(
                     message_id=message_id,
                     was_grounded=chunk.get("is_grounded", True),
                     processing_time_ms=processing_time
                 )
-                yield json.dumps(done.model_dump())
+                yield encode_event(done.model_dump())
                 logger.info(f"SSE done: {processing_time}ms, grounded={chunk.get('is_grounded')}")
 
             elif event_type == "error":
                 # Error during streaming
                 error = StreamError(message=chunk.get("message", "Unknown error"), code="STREAM_ERROR")
-                yield json.dumps(error.model_dump())
+                yield encode_event(error.model_dump())
                 logger.error(f"SSE error: {chunk.get('message')}")
 
     except Exception as e:
         logger.error(f"Stream error: {e}", exc_info=True)
         error = StreamError(message=str(e), code="STREAM_ERROR")
-        yield json.dumps(error.model_dump())
+        yield encode_event(error.model_dump())
 
 
 @router.post("/", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, pipeline: RAGPipeline = Depends(get_pipeline)):
     """
     Non-streaming chat endpoint.
     Returns complete response with sources.
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     session_id = request.session_id or str(uuid.uuid4())
 
     try:
-        pipeline = get_pipeline()
-
         result = await pipeline.aquery(
             question=request.message,
             session_id=session_id,
             collection_name=request.collection_name,
         )
 
-        processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
 
         # Convert sources to response format
-        sources = []
-        for s in result.get("sources", []):
-            if isinstance(s, dict):
-                sources.append(Source(
-                    filename=s.get("source", "unknown"),
-                    chunk_id=s.get("chunk_id", ""),
-                    relevance_score=s.get("relevance_score", 0.0),
-                    content_preview=s.get("content_preview", s.get("page_content", "")[:200]),
-                    page=s.get("page"),
-                ))
+        sources = [
+            Source(
+                filename=s.get("source", "unknown"),
+                chunk_id=s.get("chunk_id", ""),
+                relevance_score=s.get("relevance_score", 0.0),
+                content_preview=s.get("content_preview", s.get("page_content", "")[:200]),
+                page=s.get("page"),
+            )
+            for s in result.get("sources") or ()
+        ]
 
         return ChatResponse(
             message_id=str(uuid.uuid4()),
@@ -190,7 +235,7 @@ async def chat(request: ChatRequest):
 
 
 @router.post("/stream")
-async def chat_stream(request: ChatRequest):
+async def chat_stream(request: ChatRequest, pipeline: RAGPipeline = Depends(get_pipeline)):
     """
     Streaming chat endpoint (legacy).
     Returns Server-Sent Events with tokens and sources.
@@ -207,15 +252,21 @@ async def chat_stream(request: ChatRequest):
 
     return EventSourceResponse(
         generate_stream(
+            pipeline,
             message=request.message,
             session_id=session_id,
             collection_name=request.collection_name
-        )
+        ),
+        send_timeout=SSE_SEND_TIMEOUT,
     )
 
 
 @router.post("/{chat_id}/stream")
-async def chat_stream_scoped(chat_id: str, request: ChatRequest):
+async def chat_stream_scoped(
+    chat_id: str,
+    request: ChatRequest,
+    pipeline: RAGPipeline = Depends(get_pipeline),
+):
     """
     Chat-scoped streaming endpoint (ADR-007).
     Returns Server-Sent Events with tokens and sources.
@@ -225,11 +276,13 @@ async def chat_stream_scoped(chat_id: str, request: ChatRequest):
 
     return EventSourceResponse(
         generate_stream(
+            pipeline,
             message=request.message,
             session_id=session_id,
             collection_name=None,  # Not used when chat_id provided
             chat_id=chat_id
-        )
+        ),
+        send_timeout=SSE_SEND_TIMEOUT,
     )
 
 
@@ -259,23 +312,12 @@ async def clear_chat_history(session_id: str):
 # CHAT-SCOPED DOCUMENT ENDPOINTS (ADR-007)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@lru_cache(maxsize=4096)
 def get_chat_collection_name(chat_id: str) -> str:
-    """Get the collection name for a chat. Format: chat_{chat_id}"""
+    """Get the collection name for a chat. Format: chat_{chat_id} (cached per chat_id)"""
     return f"chat_{chat_id}"
 
 
-# Lazy-initialized vector store for document operations
-_vector_store = None
-
-
-def get_vector_store():
-    """Get or create the vector store instance."""
-    global _vector_store
-    if _vector_store is None:
-        _vector_store = VectorStore()
-    return _vector_store
-
-
 @router.post("/{chat_id}/documents", response_model=DocumentUploadResponse)
 async def upload_documents(
     chat_id: str,
@@ -284,74 +326,92 @@ async def upload_documents(
     """
     Upload one or more documents to the chat's collection.
     Creates collection if it doesn't exist.
+    All accepted files are embedded and stored in one batch.
     """
     collection_name = get_chat_collection_name(chat_id)
     uploaded = []
     failed = []
+    # (tmp_path, doc_id, filename) per file saved for ingestion
+    saved = []
 
-    for file in files:
-        filename = file.filename or "unknown"
-        ext = Path(filename).suffix.lower()
+    try:
+        for file in files:
+            filename = file.filename or "unknown"
+            ext = os.path.splitext(filename)[1].lower()
+
+            # Validate file type
+            if ext not in SUPPORTED_FILE_TYPES:
+                failed.append(DocumentUploadFailed(
+                    name=filename,
+                    error=f"Unsupported file type: {ext}. Supported: {', '.join(SUPPORTED_FILE_TYPES)}"
+                ))
+                continue
 
-        # Validate file type
-        if ext not in SUPPORTED_FILE_TYPES:
-            failed.append(DocumentUploadFailed(
-                name=filename,
-                error=f"Unsupported file type: {ext}. Supported: {', '.join(SUPPORTED_FILE_TYPES)}"
-            ))
-            continue
+            try:
+                # Save to temp file (aiofiles: disk writes stay off the event loop)
+                async with aiofiles.tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
+                    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                        await tmp.write(chunk)
+                saved.append((tmp.name, str(uuid.uuid4()), filename))
+            except Exception as e:
+                logger.error(f"Failed to upload {filename}: {e}")
+                failed.append(DocumentUploadFailed(
+                    name=filename,
+                    error=str(e)
+                ))
 
-        try:
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-                content = await file.read()
-                tmp.write(content)
-                tmp_path = tmp.name
+        # Use ingestion service with chat's collection
+        jobs = await ingestion_service.process_files(collection_name, saved) if saved else []
 
+        for job, (_, doc_id, filename) in zip(jobs, saved):
+            if job.status.value == "completed":
+                uploaded.append(DocumentUploadResult(
+                    id=doc_id,
+                    name=filename,
+                    chunk_count=job.chunks_created
+                ))
+            else:
+                failed.append(DocumentUploadFailed(
+                    name=filename,
+                    error=job.errors[0] if job.errors else "Unknown error"
+                ))
+    finally:
+        # Cleanup temp files
+        for tmp_path, _, _ in saved:
             try:
-                # Generate doc_id for this document
-                doc_id = str(uuid.uuid4())
-
-                # Use ingestion service with chat's collection
-                job = ingestion_service.create_job(collection_name, document_count=1)
-                await ingestion_service._process_file(job, tmp_path, doc_id=doc_id, original_filename=filename)
-
-                if job.status.value == "completed":
-                    uploaded.append(DocumentUploadResult(
-                        id=doc_id,
-                        name=filename,
-                        chunk_count=job.chunks_created
-                    ))
-                else:
-                    failed.append(DocumentUploadFailed(
-                        name=filename,
-                        error=job.errors[0] if job.errors else "Unknown error"
-                    ))
-            finally:
-                # Cleanup temp file
-                os.unlink(tmp_path)
+                await aiofiles.os.remove(tmp_path)
+            except OSError as e:
+                # Keep going: the other files still need removing, and the
+                # original error (if any) must not be masked
+                logger.warning(f"Could not remove temp file {tmp_path}: {e}")
 
-        except Exception as e:
-            logger.error(f"Failed to upload {filename}: {e}")
-            failed.append(DocumentUploadFailed(
-                name=filename,
-                error=str(e)
-            ))
+    if uploaded:
+        # The chat's collection may be new, and its document list has changed
+        collections_cache.clear()
+        documents_cache.pop_matching(lambda key: key[0] == collection_name)
 
     return DocumentUploadResponse(uploaded=uploaded, failed=failed)
 
 
 @router.get("/{chat_id}/documents", response_model=DocumentListResponse)
-async def list_documents(chat_id: str):
+async def list_documents(
+    chat_id: str,
+    vector_store: ChromaVectorStore = Depends(get_vector_store),
+):
     """
     List all documents belonging to this chat.
     """
     collection_name = get_chat_collection_name(chat_id)
-    vector_store = get_vector_store()
+    # Keyed on the version read before the await, so a listing raced by a
+    # write is stored under the old version and never served again
+    cache_key = (collection_name, vector_store.collection_version(collection_name))
+    cached = documents_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
         docs = await vector_store.list_documents(collection_name)
-        return DocumentListResponse(
+        response = DocumentListResponse(
             documents=[
                 ChatDocument(
                     id=d.doc_id,
@@ -365,24 +425,31 @@ async def list_documents(chat_id: str):
             ],
             total_count=len(docs)
         )
+        documents_cache.set(cache_key, response)
+        return response
     except Exception as e:
         logger.error(f"Failed to list documents for chat {chat_id}: {e}")
         return DocumentListResponse(documents=[], total_count=0)
 
 
 @router.delete("/{chat_id}/documents/{doc_id}", response_model=DocumentDeleteResponse)
-async def delete_document(chat_id: str, doc_id: str):
+async def delete_document(
+    chat_id: str,
+    doc_id: str,
+    vector_store: ChromaVectorStore = Depends(get_vector_store),
+):
     """
     Delete a single document and all its chunks.
     """
     collection_name = get_chat_collection_name(chat_id)
-    vector_store = get_vector_store()
 
     try:
         deleted_count = await vector_store.delete_by_metadata(
             collection_name,
             {"doc_id": doc_id}
         )
+        documents_cache.pop_matching(lambda key: key[0] == collection_name)
+        preview_cache.pop_matching(lambda key: key[:2] == (collection_name, doc_id))
         return DocumentDeleteResponse(
             success=deleted_count > 0,
             deleted_chunks=deleted_count
@@ -393,34 +460,45 @@ async def delete_document(chat_id: str, doc_id: str):
 
 
 @router.delete("/{chat_id}", response_model=ChatDeleteResponse)
-async def delete_chat(chat_id: str):
+async def delete_chat(
+    chat_id: str,
+    vector_store: ChromaVectorStore = Depends(get_vector_store),
+):
     """
     Delete chat, its message history, and ALL documents.
     """
     collection_name = get_chat_collection_name(chat_id)
-    vector_store = get_vector_store()
+
+    async def drop_collection():
+        # Get document and chunk counts before deletion
+        counts = await vector_store.get_collection_stats(collection_name)
+        # Delete the collection
+        await vector_store.delete_collection(collection_name)
+        return counts
+
+    # The two deletions are independent. The history clear is started first:
+    # it yields at its first aiosqlite/Redis call, and its I/O then runs
+    # while the Chroma calls (synchronous inside their coroutines) proceed.
+    memory_result, collection_result = await asyncio.gather(
+        memory_store.clear_history(chat_id),
+        drop_collection(),
+        return_exceptions=True,
+    )
 
     deleted_docs = 0
     deleted_chunks = 0
-    memory_cleared = False
+    if isinstance(collection_result, Exception):
+        logger.warning(f"Failed to delete collection for chat {chat_id}: {collection_result}")
+    else:
+        deleted_docs, deleted_chunks = collection_result
 
-    try:
-        # Get document count before deletion
-        docs = await vector_store.list_documents(collection_name)
-        deleted_docs = len(docs)
-        deleted_chunks = sum(d.chunk_count for d in docs)
+    collections_cache.clear()
+    documents_cache.pop_matching(lambda key: key[0] == collection_name)
+    preview_cache.pop_matching(lambda key: key[0] == collection_name)
 
-        # Delete the collection
-        await vector_store.delete_collection(collection_name)
-    except Exception as e:
-        logger.warning(f"Failed to delete collection for chat {chat_id}: {e}")
-
-    try:
-        # Clear memory history
-        await memory_store.clear_history(chat_id)
-        memory_cleared = True
-    except Exception as e:
-        logger.warning(f"Failed to clear memory for chat {chat_id}: {e}")
+    memory_cleared = not isinstance(memory_result, Exception)
+    if not memory_cleared:
+        logger.warning(f"Failed to clear memory for chat {chat_id}: {memory_result}")
 
     return ChatDeleteResponse(
         success=True,
@@ -434,13 +512,18 @@ async def delete_chat(chat_id: str):
 async def get_document_preview(
     chat_id: str,
     doc_id: str,
-    max_chars: int = 5000
+    max_chars: int = 5000,
+    vector_store: ChromaVectorStore = Depends(get_vector_store),
 ):
     """
     Get a preview of document content.
     """
     collection_name = get_chat_collection_name(chat_id)
-    vector_store = get_vector_store()
+    version = vector_store.collection_version(collection_name)
+    cache_key = (collection_name, doc_id, max_chars, version)
+    cached = preview_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
         chunks = await vector_store.get_chunks_by_doc_id(collection_name, doc_id)
@@ -451,21 +534,32 @@ async def get_document_preview(
         # Get document name from first chunk metadata
         doc_name = chunks[0].metadata.get('source', 'unknown') if chunks else 'unknown'
 
-        # Concatenate chunk content
-        full_content = "\n\n".join(c.page_content for c in chunks)
-        total_chars = len(full_content)
+        # Length of the "\n\n"-joined content, without building it
+        total_chars = sum(len(c.page_content) for c in chunks) + 2 * (len(chunks) - 1)
 
-        # Truncate if needed
+        # Truncate if needed: join only the leading chunks the preview covers
         truncated = total_chars > max_chars
-        preview = full_content[:max_chars] if truncated else full_content
-
-        return DocumentPreviewResponse(
+        if truncated:
+            parts = []
+            size = -2
+            for c in chunks:
+                parts.append(c.page_content)
+                size += len(c.page_content) + 2
+                if size >= max_chars:
+                    break
+            preview = "\n\n".join(parts)[:max_chars]
+        else:
+            preview = "\n\n".join(c.page_content for c in chunks)
+
+        response = DocumentPreviewResponse(
             id=doc_id,
             name=doc_name,
             preview=preview,
             total_chars=total_chars,
             truncated=truncated
         )
+        preview_cache.set(cache_key, response)
+        return response
     except HTTPException:
         raise
     except Exception as e:
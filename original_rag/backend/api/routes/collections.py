@@ -3,9 +3,11 @@ Collections Routes
 Manages document collections in the vector store.
 """
 import logging
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from api.cache import collections_cache, documents_cache, preview_cache
+from api.dependencies import get_vector_store
 from api.models import (
     CreateCollectionRequest,
     CollectionInfo,
@@ -13,59 +15,52 @@ from api.models import (
     CollectionDocumentsResponse,
 )
 from config.settings import settings
-from vectorstore.store import VectorStore
+from vectorstore.store import ChromaVectorStore
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/collections", tags=["Collections"])
 
-# Lazy-initialized vector store
-_vectorstore = None
-
-
-def get_vectorstore():
-    """Get or create the vector store instance."""
-    global _vectorstore
-    if _vectorstore is None:
-        _vectorstore = VectorStore()
-    return _vectorstore
-
-
 @router.get("/", response_model=CollectionListResponse)
-async def list_collections():
+async def list_collections(store: ChromaVectorStore = Depends(get_vector_store)):
     """
     List all collections.
     """
-    try:
-        store = get_vectorstore()
-        collection_names = await store.list_collections()
+    cached = collections_cache.get("all")
+    if cached is not None:
+        return cached
 
-        collections = []
-        for name in collection_names:
-            collections.append(
-                CollectionInfo(
-                    name=name,
-                    description="",
-                    document_count=0,  # TODO: Get actual count
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow(),
-                )
+    now = datetime.now(timezone.utc)
+    try:
+        counts = await store.list_collections_with_counts()
+
+        collections = [
+            CollectionInfo(
+                name=name,
+                description="",
+                document_count=count,
+                created_at=now,
+                updated_at=now,
             )
+            for name, count in counts.items()
+        ]
 
         # Ensure default collection exists
-        if settings.collection_name not in collection_names:
+        if settings.collection_name not in counts:
             collections.insert(
                 0,
                 CollectionInfo(
                     name=settings.collection_name,
                     description="Default knowledge base",
                     document_count=0,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow(),
+                    created_at=now,
+                    updated_at=now,
                 ),
             )
 
-        return CollectionListResponse(collections=collections, total=len(collections))
+        response = CollectionListResponse(collections=collections, total=len(collections))
+        collections_cache.set("all", response)
+        return response
 
     except Exception as e:
         logger.error(f"Error listing collections: {e}")
@@ -76,8 +71,8 @@ async def list_collections():
                     name=settings.collection_name,
                     description="Default knowledge base",
                     document_count=0,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow(),
+                    created_at=now,
+                    updated_at=now,
                 )
             ],
             total=1,
@@ -91,22 +86,25 @@ async def create_collection(request: CreateCollectionRequest):
     """
     # Collections are created automatically when documents are added
     # This endpoint just validates and returns the collection info
+    now = datetime.now(timezone.utc)
     return CollectionInfo(
         name=request.name,
         description=request.description or "",
         document_count=0,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
+        created_at=now,
+        updated_at=now,
     )
 
 
 @router.get("/{collection_name}", response_model=CollectionInfo)
-async def get_collection(collection_name: str):
+async def get_collection(
+    collection_name: str,
+    store: ChromaVectorStore = Depends(get_vector_store),
+):
     """
     Get collection details.
     """
     try:
-        store = get_vectorstore()
         collections = await store.list_collections()
 
         if collection_name not in collections:
@@ -114,12 +112,13 @@ async def get_collection(collection_name: str):
                 status_code=404, detail=f"Collection '{collection_name}' not found"
             )
 
+        now = datetime.now(timezone.utc)
         return CollectionInfo(
             name=collection_name,
             description="",
             document_count=0,  # TODO: Get actual count
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
 
     except HTTPException:
@@ -130,7 +129,11 @@ async def get_collection(collection_name: str):
 
 
 @router.delete("/{collection_name}")
-async def delete_collection(collection_name: str, confirm: bool = Query(False)):
+async def delete_collection(
+    collection_name: str,
+    confirm: bool = Query(False),
+    store: ChromaVectorStore = Depends(get_vector_store),
+):
     """
     Delete a collection.
     Requires confirm=true query parameter.
@@ -146,8 +149,10 @@ async def delete_collection(collection_name: str, confirm: bool = Query(False)):
         )
 
     try:
-        store = get_vectorstore()
         await store.delete_collection(collection_name)
+        collections_cache.clear()
+        documents_cache.pop_matching(lambda key: key[0] == collection_name)
+        preview_cache.pop_matching(lambda key: key[0] == collection_name)
         return {"message": f"Collection '{collection_name}' deleted"}
 
     except Exception as e:
@@ -3,7 +3,9 @@ Ingestion Routes
 Handles document ingestion from various sources.
 """
 import os
-import tempfile
+
+import aiofiles
+import aiofiles.os
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
 from typing import Optional
 
@@ -18,6 +20,12 @@ from ingest import ingestion_service, DocumentLoader
 
 router = APIRouter(prefix="/ingest", tags=["Ingestion"])
 
+# Uploads are copied to disk in chunks of this size, never whole
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Maximum accepted upload size (50MB)
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
 
 @router.post("/texts", response_model=IngestResponse)
 async def ingest_texts(request: IngestTextRequest):
@@ -61,26 +69,32 @@ async def ingest_file(
             detail=f"Unsupported file type: {ext}. Allowed: {list(DocumentLoader.SUPPORTED_EXTENSIONS)}",
         )
 
-    # Read file content
-    content = await file.read()
-
-    # Validate file size (max 50MB)
-    max_size = 50 * 1024 * 1024
-    if len(content) > max_size:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size: {max_size // (1024*1024)}MB",
-        )
-
     collection = collection_name or settings.collection_name
 
-    # Save to temp file for processing
+    # Save to temp file for processing. The upload cannot be handed to the
+    # ingestion job directly: the job runs in the background after this
+    # response is sent, when Starlette has already closed UploadFile.file,
+    # and the PDF/DOCX loaders open files by path.
     settings.uploads_dir.mkdir(parents=True, exist_ok=True)
     temp_path = settings.uploads_dir / f"{file.filename}"
 
     try:
-        with open(temp_path, "wb") as f:
-            f.write(content)
+        # Stream to disk, stopping as soon as the size limit is exceeded
+        size = 0
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_SIZE:
+                    break
+                await f.write(chunk)
+
+        # Validate file size (max 50MB)
+        if size > MAX_UPLOAD_SIZE:
+            await aiofiles.os.remove(temp_path)
+            raise HTTPException(
+                status_code=400,
+                detail=f"File too large. Maximum size: {MAX_UPLOAD_SIZE // (1024*1024)}MB",
+            )
 
         # Start ingestion job
         job = await ingestion_service.ingest_file(
@@ -96,6 +110,8 @@ async def ingest_file(
             message=f"File '{file.filename}' queued for ingestion",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         # Clean up temp file on error
         if temp_path.exists():
@@ -7,6 +7,12 @@ Isolation measures:
 2. Unique session_id per query (no memory bleed)
 3. Ingests real PDF before testing
 4. Cleans up collection after test
+
+Queries run concurrently, up to BENCHMARK_CONCURRENCY at a time (default
+8); set it to 1 to measure each query's latency in isolation.
+
+With EMBEDDING_CACHE_ENABLED=true and EMBEDDING_CACHE_FOR_QUERIES=true,
+repeat runs reuse the query embeddings stored by earlier ones.
 """
 import asyncio
 import time
@@ -14,23 +20,30 @@ import sys
 import os
 sys.path.insert(0, '.')
 
+import numpy as np
+
+from benchmark_utils import BenchQuery, build_pipeline, latency_arrays, print_latency
+
+# Max queries in flight at once
+CONCURRENCY = int(os.environ.get("BENCHMARK_CONCURRENCY", "8"))
+
 # Test document path
 TEST_DOC_PATH = r"c:\Users\guyle\Desktop\Toon\original_rag\RAG_Scale_Tests\doc_a_large.pdf"
 
 # 8 Test queries - mix of simple and complex
-TEST_QUERIES = [
+TEST_QUERIES = (
     # Simple RAG queries (should use K=2, skip hallucination)
-    {"query": "What is the CAP theorem?", "type": "simple"},
-    {"query": "What is load balancing?", "type": "simple"},
-    {"query": "What is a CDN?", "type": "simple"},
-    {"query": "What is consistent hashing?", "type": "simple"},
+    BenchQuery("What is the CAP theorem?", "simple"),
+    BenchQuery("What is load balancing?", "simple"),
+    BenchQuery("What is a CDN?", "simple"),
+    BenchQuery("What is consistent hashing?", "simple"),
     # Complex RAG queries (should use K=5, full hallucination check)
-    {"query": "Compare SQL and NoSQL databases and their tradeoffs", "type": "complex"},
-    {"query": "How does database sharding work and what are the challenges?", "type": "complex"},
+    BenchQuery("Compare SQL and NoSQL databases and their tradeoffs", "complex"),
+    BenchQuery("How does database sharding work and what are the challenges?", "complex"),
     # Non-RAG queries (instant)
-    {"query": "hi", "type": "greeting"},
-    {"query": "thanks", "type": "gratitude"},
-]
+    BenchQuery("hi", "greeting", expect_rag=False),
+    BenchQuery("thanks", "gratitude", expect_rag=False),
+)
 
 
 async def ingest_document(collection_name: str, file_path: str) -> int:
@@ -61,8 +74,8 @@ async def ingest_document(collection_name: str, file_path: str) -> int:
 
 async def cleanup_collection(collection_name: str):
     """Delete the test collection."""
-    from vectorstore.store import VectorStore
-    vs = VectorStore()
+    from vectorstore.store import get_default_store
+    vs = get_default_store()
     try:
         await vs.delete_collection(collection_name)
         print(f"Cleaned up collection: {collection_name}")
@@ -71,8 +84,6 @@ async def cleanup_collection(collection_name: str):
 
 
 async def run_benchmark():
-    from rag.pipeline import RAGPipeline
-
     # Generate unique collection name (complete isolation)
     run_id = int(time.time())
     collection_name = f"benchmark_{run_id}"
@@ -86,12 +97,16 @@ async def run_benchmark():
     print("=" * 70)
     print()
 
-    # Step 1: Ingest document
+    # Step 1: Ingest document, building the pipeline (model load, Chroma
+    # open, embedder warmup) in a worker thread meanwhile
     print("[STEP 1] Ingesting test document...")
     ingest_start = time.time()
-    chunk_count = await ingest_document(collection_name, TEST_DOC_PATH)
+    chunk_count, pipeline = await asyncio.gather(
+        ingest_document(collection_name, TEST_DOC_PATH),
+        asyncio.to_thread(build_pipeline),
+    )
     ingest_time = time.time() - ingest_start
-    print(f"Ingestion time: {ingest_time:.2f}s")
+    print(f"Ingestion time (with pipeline startup): {ingest_time:.2f}s")
     print()
 
     if chunk_count == 0:
@@ -102,60 +117,64 @@ async def run_benchmark():
     print("[STEP 2] Running 8 test queries...")
     print("-" * 70)
 
-    pipeline = RAGPipeline()
-    results = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
 
-    for i, test in enumerate(TEST_QUERIES, 1):
-        query = test["query"]
-        query_type = test["type"]
+    async def run_one(i: int, test: BenchQuery) -> dict:
+        query = test.query
+        query_type = test.type
 
         # Unique session per query (no memory contamination)
         session_id = f"bench_{run_id}_q{i}"
 
-        print(f"[{i}/8] {query[:50]}...")
-
-        start = time.time()
-        try:
-            result = await pipeline.aquery(
-                question=query,
-                session_id=session_id,
-                collection_name=collection_name
-            )
-            elapsed = time.time() - start
-
-            complexity = result.get("query_complexity", "N/A")
-            sources = len(result.get("sources", []))
-            grounded = result.get("is_grounded", False)
-            steps = result.get("processing_steps", [])
-            answer = result.get("answer", "")
-
-            # Quality: has real answer?
-            has_answer = len(answer) > 30 and "error" not in answer.lower()
-
-            results.append({
-                "query": query,
-                "type": query_type,
-                "latency": elapsed,
-                "complexity": complexity,
-                "sources": sources,
-                "grounded": grounded,
-                "has_answer": has_answer,
-                "steps": steps,
-                "answer_preview": answer[:100]
-            })
-
-            status = "PASS" if has_answer or query_type in ["greeting", "gratitude"] else "FAIL"
-            print(f"      {elapsed:.2f}s | {complexity} | {sources} sources | {status}")
-
-        except Exception as e:
-            elapsed = time.time() - start
-            print(f"      ERROR: {str(e)[:80]}")
-            results.append({
-                "query": query,
-                "type": query_type,
-                "latency": elapsed,
-                "error": str(e)
-            })
+        async with semaphore:
+            start = time.time()
+            try:
+                result = await pipeline.aquery(
+                    question=query,
+                    session_id=session_id,
+                    collection_name=collection_name
+                )
+                elapsed = time.time() - start
+
+                complexity = result.get("query_complexity", "N/A")
+                sources = len(result.get("sources", []))
+                grounded = result.get("is_grounded", False)
+                steps = result.get("processing_steps", [])
+                answer = result.get("answer", "")
+
+                # Quality: has real answer?
+                has_answer = len(answer) > 30 and "error" not in answer.lower()
+
+                status = "PASS" if has_answer or not test.expect_rag else "FAIL"
+                print(f"[{i}/8] {query[:50]}... {elapsed:.2f}s | {complexity} | {sources} sources | {status}")
+
+                return {
+                    "query": query,
+                    "type": query_type,
+                    "latency": elapsed,
+                    "complexity": complexity,
+                    "sources": sources,
+                    "grounded": grounded,
+                    "has_answer": has_answer,
+                    "steps": steps,
+                    "answer_preview": answer[:100]
+                }
+
+            except Exception as e:
+                elapsed = time.time() - start
+                print(f"[{i}/8] {query[:50]}... ERROR: {str(e)[:80]}")
+                return {
+                    "query": query,
+                    "type": query_type,
+                    "latency": elapsed,
+                    "error": str(e)
+                }
+
+    # Results come back in TEST_QUERIES order; progress lines print as
+    # queries finish
+    results = await asyncio.gather(
+        *(run_one(i, test) for i, test in enumerate(TEST_QUERIES, 1))
+    )
 
     # Step 3: Results Summary
     print()
@@ -164,27 +183,18 @@ async def run_benchmark():
     print("=" * 70)
 
     # Calculate metrics
-    rag_results = [r for r in results if r["type"] in ["simple", "complex"] and "error" not in r]
-    simple_results = [r for r in rag_results if r.get("complexity") == "simple"]
-    complex_results = [r for r in rag_results if r.get("complexity") == "complex"]
+    latencies, types, complexities = latency_arrays(results)
+    rag = np.isin(types, ["simple", "complex"])
 
-    passed = sum(1 for r in results if r.get("has_answer", False) or r["type"] in ["greeting", "gratitude"])
+    passed = sum(1 for test, r in zip(TEST_QUERIES, results) if r.get("has_answer", False) or not test.expect_rag)
     quality_pct = (passed / len(results)) * 100
 
     print(f"Tests Passed: {passed}/8 ({quality_pct:.0f}%)")
     print()
 
-    if rag_results:
-        avg_rag = sum(r["latency"] for r in rag_results) / len(rag_results)
-        print(f"Avg RAG Latency: {avg_rag:.2f}s")
-
-    if simple_results:
-        avg_simple = sum(r["latency"] for r in simple_results) / len(simple_results)
-        print(f"Avg Simple Query: {avg_simple:.2f}s (Adaptive K=2)")
-
-    if complex_results:
-        avg_complex = sum(r["latency"] for r in complex_results) / len(complex_results)
-        print(f"Avg Complex Query: {avg_complex:.2f}s (K=5)")
+    print_latency("Avg RAG Latency", latencies[rag])
+    print_latency("Avg Simple Query", latencies[rag & (complexities == "simple")], " (Adaptive K=2)")
+    print_latency("Avg Complex Query", latencies[rag & (complexities == "complex")], " (K=5)")
 
     print()
     print("Detailed Results:")
@@ -192,12 +202,12 @@ async def run_benchmark():
     print(f"{'#':<3} {'Query':<35} {'Type':<8} {'Time':>7} {'Src':>4} {'Status':<6}")
     print("-" * 70)
 
-    for i, r in enumerate(results, 1):
+    for i, (test, r) in enumerate(zip(TEST_QUERIES, results), 1):
         q = r["query"][:33] + ".." if len(r["query"]) > 35 else r["query"]
         t = r["type"][:8]
         latency = f"{r['latency']:.1f}s" if "error" not in r else "ERR"
         src = str(r.get("sources", "-"))
-        status = "PASS" if r.get("has_answer") or r["type"] in ["greeting", "gratitude"] else "FAIL"
+        status = "PASS" if r.get("has_answer") or not test.expect_rag else "FAIL"
         if "error" in r:
             status = "ERROR"
         print(f"{i:<3} {q:<35} {t:<8} {latency:>7} {src:>4} {status:<6}")
@@ -6,26 +6,40 @@ Key isolation measures:
 1. Unique session_id per test run (no memory bleed)
 2. Uses existing knowledge_base collection (has system-design-primer.txt)
 3. Each query gets unique session to prevent followup confusion
+
+Queries run concurrently, up to BENCHMARK_CONCURRENCY at a time (default
+8); set it to 1 to measure each query's latency in isolation.
+
+With EMBEDDING_CACHE_ENABLED=true and EMBEDDING_CACHE_FOR_QUERIES=true,
+repeat runs reuse the query embeddings stored by earlier ones.
 """
 import asyncio
+import os
 import time
 import sys
 sys.path.insert(0, '.')
 
+import numpy as np
+
+from benchmark_utils import BenchQuery, latency_arrays, print_latency
+
+# Max queries in flight at once
+CONCURRENCY = int(os.environ.get("BENCHMARK_CONCURRENCY", "8"))
+
 # Test queries matching the original benchmark
-TEST_QUERIES = [
+TEST_QUERIES = (
     # RAG queries (simple)
-    {"query": "What is the CAP theorem?", "type": "simple_rag", "expect_rag": True},
-    {"query": "What is load balancing?", "type": "simple_rag", "expect_rag": True},
-    {"query": "What is consistent hashing?", "type": "simple_rag", "expect_rag": True},
-    {"query": "What is a CDN?", "type": "simple_rag", "expect_rag": True},
+    BenchQuery("What is the CAP theorem?", "simple_rag"),
+    BenchQuery("What is load balancing?", "simple_rag"),
+    BenchQuery("What is consistent hashing?", "simple_rag"),
+    BenchQuery("What is a CDN?", "simple_rag"),
     # RAG queries (complex)
-    {"query": "Compare SQL and NoSQL databases", "type": "complex_rag", "expect_rag": True},
-    {"query": "How does database sharding work and what are the tradeoffs?", "type": "complex_rag", "expect_rag": True},
+    BenchQuery("Compare SQL and NoSQL databases", "complex_rag"),
+    BenchQuery("How does database sharding work and what are the tradeoffs?", "complex_rag"),
     # Non-RAG queries
-    {"query": "hi", "type": "greeting", "expect_rag": False},
-    {"query": "thanks", "type": "gratitude", "expect_rag": False},
-]
+    BenchQuery("hi", "greeting", expect_rag=False),
+    BenchQuery("thanks", "gratitude", expect_rag=False),
+)
 
 async def run_benchmark():
     from rag.pipeline import RAGPipeline
@@ -40,78 +54,76 @@ async def run_benchmark():
     print()
 
     pipeline = RAGPipeline()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
 
-    results = []
-    total_rag_time = 0
-    rag_count = 0
-
-    for i, test in enumerate(TEST_QUERIES, 1):
-        query = test["query"]
-        query_type = test["type"]
-        expect_rag = test["expect_rag"]
+    async def run_one(i: int, test: BenchQuery) -> dict:
+        query = test.query
+        query_type = test.type
+        expect_rag = test.expect_rag
 
         # ISOLATION: Unique session per query
         session_id = f"bench_{run_id}_{i}"
-
-        print(f"[{i}/8] {query_type.upper()}: {query[:50]}...")
-
-        start = time.time()
-        try:
-            result = await pipeline.aquery(
-                question=query,
-                session_id=session_id,
-                collection_name="knowledge_base"  # Use existing collection
-            )
-            elapsed = time.time() - start
-
-            # Extract key metrics
-            complexity = result.get("query_complexity", "N/A")
-            intent = result.get("detected_intent", "N/A")
-            sources_count = len(result.get("sources", []))
-            is_grounded = result.get("is_grounded", False)
-            steps = result.get("processing_steps", [])
-            answer = result.get("answer", "")[:150]
-
-            # Check if RAG was used
-            used_rag = "retrieve" in str(steps) or "generate" in str(steps)
-
-            # Quality check: did we get a real answer?
-            has_answer = len(answer) > 20
-
-            results.append({
-                "query": query,
-                "type": query_type,
-                "latency": elapsed,
-                "complexity": complexity,
-                "intent": intent,
-                "sources": sources_count,
-                "grounded": is_grounded,
-                "used_rag": used_rag,
-                "has_answer": has_answer,
-                "steps": steps,
-            })
-
-            # Track RAG latencies separately
-            if expect_rag:
-                total_rag_time += elapsed
-                rag_count += 1
-
-            # Status indicator
-            status = "PASS" if has_answer else "FAIL"
-            if expect_rag and not used_rag:
-                status = "WARN"
-
-            print(f"       Latency: {elapsed:.2f}s | Complexity: {complexity} | Sources: {sources_count} | {status}")
-
-        except Exception as e:
-            elapsed = time.time() - start
-            print(f"       ERROR: {str(e)[:100]}")
-            results.append({
-                "query": query,
-                "type": query_type,
-                "latency": elapsed,
-                "error": str(e),
-            })
+        label = f"[{i}/8] {query_type.upper()}: {query[:50]}..."
+
+        async with semaphore:
+            start = time.time()
+            try:
+                result = await pipeline.aquery(
+                    question=query,
+                    session_id=session_id,
+                    collection_name="knowledge_base"  # Use existing collection
+                )
+                elapsed = time.time() - start
+
+                # Extract key metrics
+                complexity = result.get("query_complexity", "N/A")
+                intent = result.get("detected_intent", "N/A")
+                sources_count = len(result.get("sources", []))
+                is_grounded = result.get("is_grounded", False)
+                steps = result.get("processing_steps", [])
+                answer = result.get("answer", "")[:150]
+
+                # Check if RAG was used
+                used_rag = "retrieve" in str(steps) or "generate" in str(steps)
+
+                # Quality check: did we get a real answer?
+                has_answer = len(answer) > 20
+
+                # Status indicator
+                status = "PASS" if has_answer else "FAIL"
+                if expect_rag and not used_rag:
+                    status = "WARN"
+
+                print(f"{label}\n       Latency: {elapsed:.2f}s | Complexity: {complexity} | Sources: {sources_count} | {status}")
+
+                return {
+                    "query": query,
+                    "type": query_type,
+                    "latency": elapsed,
+                    "complexity": complexity,
+                    "intent": intent,
+                    "sources": sources_count,
+                    "grounded": is_grounded,
+                    "used_rag": used_rag,
+                    "has_answer": has_answer,
+                    "steps": steps,
+                }
+
+            except Exception as e:
+                elapsed = time.time() - start
+                print(f"{label}\n       ERROR: {str(e)[:100]}")
+                return {
+                    "query": query,
+                    "type": query_type,
+                    "latency": elapsed,
+                    "error": str(e),
+                }
+
+    # Results come back in TEST_QUERIES order; progress lines print as
+    # queries finish
+    results = await asyncio.gather(
+        *(run_one(i, test) for i, test in enumerate(TEST_QUERIES, 1))
+    )
 
     # Summary
     print()
@@ -120,19 +132,13 @@ async def run_benchmark():
     print("=" * 70)
 
     # Calculate metrics
-    passed = sum(1 for r in results if r.get("has_answer", False) or not TEST_QUERIES[results.index(r)]["expect_rag"])
-    avg_rag_latency = total_rag_time / rag_count if rag_count > 0 else 0
-
-    simple_rag_times = [r["latency"] for r in results if r.get("complexity") == "simple" and "error" not in r]
-    complex_rag_times = [r["latency"] for r in results if r.get("complexity") == "complex" and "error" not in r]
+    passed = sum(1 for test, r in zip(TEST_QUERIES, results) if r.get("has_answer", False) or not test.expect_rag)
+    latencies, types, complexities = latency_arrays(results)
 
     print(f"Tests Passed: {passed}/8")
-    print(f"Avg RAG Latency: {avg_rag_latency:.2f}s")
-
-    if simple_rag_times:
-        print(f"Avg Simple Query: {sum(simple_rag_times)/len(simple_rag_times):.2f}s (K=2 docs)")
-    if complex_rag_times:
-        print(f"Avg Complex Query: {sum(complex_rag_times)/len(complex_rag_times):.2f}s (K=5 docs)")
+    print_latency("Avg RAG Latency", latencies[np.isin(types, ["simple_rag", "complex_rag"])])
+    print_latency("Avg Simple Query", latencies[complexities == "simple"], " (K=2 docs)")
+    print_latency("Avg Complex Query", latencies[complexities == "complex"], " (K=5 docs)")
 
     print()
     print("Detailed Results:")
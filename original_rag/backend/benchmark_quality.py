@@ -1,29 +1,40 @@
 """
 Quality Verification Benchmark
 Shows FULL LLM outputs and lets us verify against source document.
+
+Queries run concurrently, up to BENCHMARK_CONCURRENCY at a time (default
+8); set it to 1 to measure each query's latency in isolation.
+
+With EMBEDDING_CACHE_ENABLED=true and EMBEDDING_CACHE_FOR_QUERIES=true,
+repeat runs reuse the query embeddings stored by earlier ones.
 """
 import asyncio
+import os
 import time
 import sys
 sys.path.insert(0, '.')
 
+from benchmark_utils import build_pipeline, latency_arrays, print_latency
+
+# Max queries in flight at once
+CONCURRENCY = int(os.environ.get("BENCHMARK_CONCURRENCY", "8"))
+
 TEST_DOC_PATH = r"c:\Users\guyle\Desktop\Toon\original_rag\test-docs\system-design-primer.txt"
 
 # 6 RAG queries to verify quality
-TEST_QUERIES = [
+TEST_QUERIES = (
     "What is the CAP theorem?",
     "What is load balancing?",
     "What is a CDN?",
     "What is consistent hashing?",
     "Compare SQL and NoSQL databases",
     "How does database sharding work?",
-]
+)
+
 
 async def run_quality_check():
-    from rag.pipeline import RAGPipeline
     from ingest.service import ingestion_service
     import uuid
-    import os
 
     run_id = int(time.time())
     collection_name = f"quality_check_{run_id}"
@@ -34,32 +45,41 @@ async def run_quality_check():
     print(f"Collection: {collection_name}")
     print()
 
-    # Ingest document
+    # Ingest document, building the pipeline in a worker thread meanwhile
     print("[INGESTING DOCUMENT...]")
     doc_id = str(uuid.uuid4())
     job = ingestion_service.create_job(collection_name, document_count=1)
-    await ingestion_service._process_file(job, TEST_DOC_PATH, doc_id=doc_id, original_filename="system-design-primer.txt")
+    _, pipeline = await asyncio.gather(
+        ingestion_service._process_file(job, TEST_DOC_PATH, doc_id=doc_id, original_filename="system-design-primer.txt"),
+        asyncio.to_thread(build_pipeline),
+    )
     print(f"Ingested {job.chunks_created} chunks")
     print()
 
-    pipeline = RAGPipeline()
-    results = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
 
-    for i, query in enumerate(TEST_QUERIES, 1):
+    async def run_one(i: int, query: str):
         session_id = f"quality_{run_id}_{i}"
+        async with semaphore:
+            start = time.time()
+            result = await pipeline.aquery(
+                question=query,
+                session_id=session_id,
+                collection_name=collection_name
+            )
+            return result, time.time() - start
+
+    outcomes = await asyncio.gather(
+        *(run_one(i, query) for i, query in enumerate(TEST_QUERIES, 1))
+    )
+    results = []
 
+    # Full outputs are printed in query order once all have finished
+    for i, (query, (result, elapsed)) in enumerate(zip(TEST_QUERIES, outcomes), 1):
         print("=" * 80)
         print(f"QUERY {i}/6: {query}")
         print("=" * 80)
 
-        start = time.time()
-        result = await pipeline.aquery(
-            question=query,
-            session_id=session_id,
-            collection_name=collection_name
-        )
-        elapsed = time.time() - start
-
         answer = result.get("answer", "NO ANSWER")
         sources = result.get("sources", [])
         complexity = result.get("query_complexity", "N/A")
@@ -86,8 +106,8 @@ async def run_quality_check():
         })
 
     # Cleanup
-    from vectorstore.store import VectorStore
-    vs = VectorStore()
+    from vectorstore.store import get_default_store
+    vs = get_default_store()
     await vs.delete_collection(collection_name)
 
     # Summary
@@ -100,9 +120,9 @@ async def run_quality_check():
         q = r["query"][:38] + ".." if len(r["query"]) > 40 else r["query"]
         print(f"{q:<40} {r['latency']:>7.1f}s {r['answer_length']:>8} {r['sources']:>8}")
 
-    avg_latency = sum(r["latency"] for r in results) / len(results)
+    latencies, _, _ = latency_arrays(results)
     print("-" * 80)
-    print(f"Average Latency: {avg_latency:.1f}s")
+    print_latency("Average Latency", latencies)
 
 if __name__ == "__main__":
     asyncio.run(run_quality_check())
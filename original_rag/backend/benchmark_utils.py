@@ -0,0 +1,48 @@
+"""
+Benchmark Utilities
+Query definitions, pipeline setup and latency summaries shared by the
+benchmark_*.py scripts.
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class BenchQuery:
+    """One benchmark query and what it should exercise."""
+    query: str
+    type: str
+    # False for small talk, which is answered without retrieval
+    expect_rag: bool = True
+
+
+def build_pipeline():
+    """Build the pipeline and warm its embedder. Blocking: run via asyncio.to_thread."""
+    from rag.pipeline import RAGPipeline
+    pipeline = RAGPipeline()
+    pipeline.vectorstore.embeddings.embed_query("warmup")
+    return pipeline
+
+
+def latency_arrays(results: List[dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collect (latency, type, complexity) arrays over the results that did not
+    error, once, so each summary line is a boolean mask instead of another
+    pass over the result dicts.
+    """
+    ok = [r for r in results if "error" not in r]
+    return (
+        np.array([r["latency"] for r in ok], dtype=float),
+        np.array([r.get("type", "") for r in ok]),
+        np.array([r.get("complexity", "") for r in ok]),
+    )
+
+
+def print_latency(label: str, latencies: np.ndarray, note: str = "") -> None:
+    """Print mean and p50/p95/p99 of latencies (seconds); nothing if empty."""
+    if latencies.size == 0:
+        return
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{label}: {latencies.mean():.2f}s{note} | p50 {p50:.2f}s p95 {p95:.2f}s p99 {p99:.2f}s")
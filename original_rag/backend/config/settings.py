@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     # === API ===
     api_host: str = Field(default="0.0.0.0", env="API_HOST")
     api_port: int = Field(default=8001, env="API_PORT")
+    # Serve /docs, /redoc and /openapi.json (turn off in production)
+    enable_docs: bool = Field(default=True, env="ENABLE_DOCS")
     cors_origins: list[str] = Field(
         default=["http://localhost:3000", "http://localhost:5173"],
         env="CORS_ORIGINS"
@@ -58,6 +60,10 @@ class Settings(BaseSettings):
     #   - openai (text-embedding-3-small): 1536 dimensions
     #   - ollama (nomic-embed-text): 768 dimensions
     # Switching providers requires re-uploading documents to rebuild embeddings.
+    # Chroma's HNSW index keeps vectors as float32 whatever is passed in, so
+    # there is no storage dtype setting: int8/float16 vectors would be widened
+    # on insert, and scoring quantized copies outside the index would replace
+    # the HNSW search with a full scan.
     embedding_provider: Literal["fastembed", "openai", "ollama"] = Field(
         default="fastembed", env="EMBEDDING_PROVIDER"
     )
@@ -70,6 +76,12 @@ class Settings(BaseSettings):
         default=256, env="FASTEMBED_BATCH_SIZE"
     )
     
+    # Persistent cache of embeddings (data_dir/embedding_cache.sqlite),
+    # keyed by model and text
+    embedding_cache_enabled: bool = Field(default=False, env="EMBEDDING_CACHE_ENABLED")
+    # Also cache query embeddings (fixed query sets such as the benchmarks)
+    embedding_cache_for_queries: bool = Field(default=False, env="EMBEDDING_CACHE_FOR_QUERIES")
+    
     # OpenAI embedding settings
     openai_embedding_model: str = Field(
         default="text-embedding-3-small", env="OPENAI_EMBEDDING_MODEL"
@@ -133,6 +145,18 @@ class Settings(BaseSettings):
     max_retries: int = Field(default=2, env="MAX_RETRIES")
     hallucination_threshold: float = Field(default=0.8, env="HALLUCINATION_THRESHOLD")
     
+    # === Semantic Cache ===
+    # Reuse answers to repeated or near-identical standalone questions
+    semantic_cache_enabled: bool = Field(default=False, env="SEMANTIC_CACHE_ENABLED")
+    # Minimum cosine similarity between question embeddings for a hit
+    semantic_cache_threshold: float = Field(default=0.92, env="SEMANTIC_CACHE_THRESHOLD")
+    # Cached answers kept per collection
+    semantic_cache_size: int = Field(default=1000, env="SEMANTIC_CACHE_SIZE")
+    
+    # === Ingestion ===
+    # Files of one upload request processed concurrently
+    max_concurrent_uploads: int = Field(default=4, env="MAX_CONCURRENT_UPLOADS")
+    
     # === Paths ===
     data_dir: Path = Field(default=Path("./data"), env="DATA_DIR")
     uploads_dir: Path = Field(default=Path("./data/uploads"), env="UPLOADS_DIR")
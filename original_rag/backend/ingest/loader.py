@@ -51,9 +51,13 @@ class DocumentLoader:
     def _load_pdf(path: Path) -> List[Document]:
         """Load PDF file."""
         try:
-            from langchain_community.document_loaders import PyPDFLoader
-            loader = PyPDFLoader(str(path))
-            docs = loader.load()
+            from langchain_community.document_loaders.blob_loaders import Blob
+            from langchain_community.document_loaders.parsers.pdf import PyPDFParser
+            # pypdf seeks and reads the file in many small pieces while it
+            # parses; read it in one go and parse from memory instead of
+            # through the 8 KB buffer of a plain file object (as PyPDFLoader does)
+            blob = Blob.from_data(path.read_bytes(), path=str(path))
+            docs = list(PyPDFParser().lazy_parse(blob))
             # Add source metadata
             for doc in docs:
                 doc.metadata['source'] = path.name
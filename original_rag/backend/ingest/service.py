@@ -15,13 +15,13 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from langchain_core.documents import Document
 
 from config.settings import settings
-from vectorstore.store import VectorStore
+from vectorstore.store import get_default_store
 from .loader import DocumentLoader
 from .chunker import ParentChildChunker
 
@@ -71,11 +71,14 @@ class IngestionService:
         self._vector_store = None
         self._chunker = ParentChildChunker()
         self._hybrid_retriever = None
+        # BM25 updates rebuild from the current index; one at a time so
+        # concurrent ingests do not drop each other's chunks
+        self._bm25_lock = asyncio.Lock()
 
     def _get_vector_store(self):
         """Lazy initialization of vector store."""
         if self._vector_store is None:
-            self._vector_store = VectorStore()
+            self._vector_store = get_default_store()
         return self._vector_store
 
     def _get_hybrid_retriever(self):
@@ -127,43 +130,8 @@ class IngestionService:
     ):
         """Process a single file with parent-child chunking."""
         try:
-            job.status = JobStatus.PROCESSING
-            job.started_at = datetime.utcnow()
             t_total = time.time()
-
-            path = Path(file_path)
-            display_name = original_filename or path.name
-            logger.info(f"Processing file: {display_name} for job {job.job_id}")
-
-            # Generate doc_id if not provided
-            document_id = doc_id or str(uuid4())
-
-            # TIMING: Load document
-            t0 = time.time()
-            documents = DocumentLoader.load(path)
-            t_load = time.time() - t0
-            logger.info(f"⏱️ PDF LOAD: {t_load:.2f}s ({len(documents)} pages)")
-
-            # TIMING: Parent-Child Chunk documents
-            t1 = time.time()
-            chunks = self._chunker.chunk(documents)
-            t_chunk = time.time() - t1
-            job.chunks_created = len(chunks)
-            logger.info(f"⏱️ CHUNKING (parent-child): {t_chunk:.2f}s ({len(chunks)} child chunks)")
-
-            # TIMING: Add metadata
-            t2 = time.time()
-            file_size = path.stat().st_size if path.exists() else 0
-            for chunk in chunks:
-                chunk.metadata['collection'] = job.collection_name
-                chunk.metadata['ingested_at'] = datetime.utcnow().isoformat()
-                chunk.metadata['doc_id'] = document_id
-                chunk.metadata['file_size'] = file_size
-                # Override source with original filename if provided (temp file path → real name)
-                if original_filename:
-                    chunk.metadata['source'] = original_filename
-            t_metadata = time.time() - t2
-            logger.info(f"⏱️ METADATA: {t_metadata:.2f}s")
+            chunks = await self._load_file_chunks(job, file_path, doc_id, original_filename)
 
             # TIMING: Store in vector database (embedding + storage)
             t3 = time.time()
@@ -178,26 +146,138 @@ class IngestionService:
             t_bm25 = time.time() - t4
             logger.info(f"⏱️ BM25 INDEX: {t_bm25:.2f}s")
 
-            job.documents_processed = 1
-            job.status = JobStatus.COMPLETED
-            job.completed_at = datetime.utcnow()
-
-            # Store doc_id for retrieval
-            job.doc_id = document_id
+            self._complete_job(job)
 
             t_total_elapsed = time.time() - t_total
             logger.info(
                 f"⏱️ TOTAL: {t_total_elapsed:.2f}s | "
-                f"Load:{t_load:.1f}s Chunk:{t_chunk:.1f}s Meta:{t_metadata:.1f}s "
                 f"Embed:{t_embed_store:.1f}s BM25:{t_bm25:.1f}s"
             )
-            logger.info(f"Job {job.job_id} completed: {job.chunks_created} chunks created for doc_id {document_id}")
 
         except Exception as e:
-            logger.error(f"Job {job.job_id} failed: {e}")
-            job.status = JobStatus.FAILED
-            job.errors.append(str(e))
-            job.completed_at = datetime.utcnow()
+            self._fail_job(job, e)
+
+    async def process_files(
+        self,
+        collection_name: str,
+        files: List[Tuple[str | Path, str, str]],
+    ) -> List[IngestionJob]:
+        """
+        Ingest several files into one collection with a single embedding call.
+
+        Args:
+            collection_name: Collection all files go into
+            files: (file_path, doc_id, original_filename) per file
+
+        Returns:
+            One job per file, in input order. A file that fails to load or
+            chunk fails only its own job; a failed embed/store fails them all.
+        """
+        jobs = [self.create_job(collection_name, document_count=1) for _ in files]
+        semaphore = asyncio.Semaphore(settings.max_concurrent_uploads)
+
+        async def load(job: IngestionJob, file_path: str | Path, doc_id: str, filename: str):
+            async with semaphore:
+                return await self._load_file_chunks(job, file_path, doc_id, filename)
+
+        loaded = await asyncio.gather(
+            *(load(job, *spec) for job, spec in zip(jobs, files)),
+            return_exceptions=True,
+        )
+
+        ready: List[IngestionJob] = []
+        all_chunks: List[Document] = []
+        for job, result in zip(jobs, loaded):
+            if isinstance(result, BaseException):
+                self._fail_job(job, result)
+            else:
+                ready.append(job)
+                all_chunks.extend(result)
+
+        if not ready:
+            return jobs
+
+        try:
+            # TIMING: One embedding + storage round for every file's chunks
+            t0 = time.time()
+            vector_store = self._get_vector_store()
+            await vector_store.add_documents(all_chunks, collection_name=collection_name)
+            logger.info(
+                f"⏱️ EMBED+STORE: {time.time() - t0:.2f}s "
+                f"({len(all_chunks)} chunks from {len(ready)} files)"
+            )
+
+            await self._update_bm25_index(collection_name, all_chunks)
+        except Exception as e:
+            for job in ready:
+                self._fail_job(job, e)
+            return jobs
+
+        for job in ready:
+            self._complete_job(job)
+        return jobs
+
+    async def _load_file_chunks(
+        self,
+        job: IngestionJob,
+        file_path: str | Path,
+        doc_id: str | None = None,
+        original_filename: str | None = None
+    ) -> List[Document]:
+        """Load, chunk and tag one file for job; embedding and storage are left to the caller."""
+        job.status = JobStatus.PROCESSING
+        job.started_at = datetime.utcnow()
+
+        path = Path(file_path)
+        display_name = original_filename or path.name
+        logger.info(f"Processing file: {display_name} for job {job.job_id}")
+
+        # Generate doc_id if not provided
+        document_id = doc_id or str(uuid4())
+        job.doc_id = document_id
+
+        # TIMING: Load document
+        t0 = time.time()
+        documents = await asyncio.to_thread(DocumentLoader.load, path)
+        t_load = time.time() - t0
+        logger.info(f"⏱️ PDF LOAD: {t_load:.2f}s ({len(documents)} pages)")
+
+        # TIMING: Parent-Child Chunk documents
+        t1 = time.time()
+        chunks = await asyncio.to_thread(self._chunker.chunk, documents)
+        t_chunk = time.time() - t1
+        job.chunks_created = len(chunks)
+        logger.info(f"⏱️ CHUNKING (parent-child): {t_chunk:.2f}s ({len(chunks)} child chunks)")
+
+        # TIMING: Add metadata
+        t2 = time.time()
+        file_size = path.stat().st_size if path.exists() else 0
+        for chunk in chunks:
+            chunk.metadata['collection'] = job.collection_name
+            chunk.metadata['ingested_at'] = datetime.utcnow().isoformat()
+            chunk.metadata['doc_id'] = document_id
+            chunk.metadata['file_size'] = file_size
+            # Override source with original filename if provided (temp file path → real name)
+            if original_filename:
+                chunk.metadata['source'] = original_filename
+        t_metadata = time.time() - t2
+        logger.info(f"⏱️ METADATA: {t_metadata:.2f}s")
+
+        return chunks
+
+    def _complete_job(self, job: IngestionJob) -> None:
+        """Mark a single-document job as completed."""
+        job.documents_processed = 1
+        job.status = JobStatus.COMPLETED
+        job.completed_at = datetime.utcnow()
+        logger.info(f"Job {job.job_id} completed: {job.chunks_created} chunks created for doc_id {job.doc_id}")
+
+    def _fail_job(self, job: IngestionJob, error: BaseException) -> None:
+        """Mark a job as failed with error."""
+        logger.error(f"Job {job.job_id} failed: {error}")
+        job.status = JobStatus.FAILED
+        job.errors.append(str(error))
+        job.completed_at = datetime.utcnow()
 
     async def _update_bm25_index(self, collection_name: str, new_chunks: List[Document], job: Optional[IngestionJob] = None):
         """Update BM25 index with new chunks.
@@ -213,8 +293,10 @@ class IngestionService:
             return
 
         try:
-            # Add new chunks to existing index (rebuilds if necessary)
-            retriever.add_to_bm25_index(collection_name, new_chunks)
+            # Add new chunks to existing index (rebuilds if necessary). The
+            # rebuild tokenizes the whole collection, so it runs off the loop
+            async with self._bm25_lock:
+                await asyncio.to_thread(retriever.add_to_bm25_index, collection_name, new_chunks)
             logger.info(f"Updated BM25 index for {collection_name}: +{len(new_chunks)} chunks")
         except Exception as e:
             error_msg = f"BM25 index update failed: {e} - hybrid search may be degraded"
@@ -7,11 +7,18 @@ from config.settings import settings
 
 if __name__ == "__main__":
     print(f"Starting {settings.app_name} v{settings.app_version}")
-    print(f"API docs: http://{settings.api_host}:{settings.api_port}/docs")
+    if settings.enable_docs:
+        print(f"API docs: http://{settings.api_host}:{settings.api_port}/docs")
 
     uvicorn.run(
         "api.main:app",
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        # uvicorn[standard] ships uvloop (not on Windows, where "auto" falls
+        # back to asyncio) and the C httptools parser; require the latter
+        loop="auto",
+        http="httptools",
+        access_log=settings.debug,
+        proxy_headers=False,
     )
@@ -6,7 +6,7 @@ import json
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from dataclasses import dataclass, asdict
 
 from config.settings import settings
@@ -133,6 +133,14 @@ class SQLiteMemoryStore(BaseMemoryStore):
         limit: int = 50,
     ) -> List[Dict[str, Any]]:
         """Get conversation history for a session."""
+        return [msg async for msg in self._iter_history(session_id, limit=limit)]
+
+    async def _iter_history(
+        self,
+        session_id: str,
+        limit: int = 50,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield conversation history for a session, oldest first, row by row."""
         if not session_id or not session_id.strip():
             raise ValueError("session_id cannot be empty")
 
@@ -141,32 +149,30 @@ class SQLiteMemoryStore(BaseMemoryStore):
 
         async with aiosqlite.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
+            # Latest N messages, put back in chronological order by SQLite
             cursor = await db.execute(
                 """
-                SELECT id, role, content, metadata, timestamp
-                FROM messages
-                WHERE session_id = ?
-                ORDER BY created_at DESC
-                LIMIT ?
+                SELECT id, role, content, metadata, timestamp FROM (
+                    SELECT id, role, content, metadata, timestamp, created_at
+                    FROM messages
+                    WHERE session_id = ?
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                )
+                ORDER BY created_at, id
                 """,
                 (session_id, limit),
             )
-            rows = await cursor.fetchall()
-
-        # Return in chronological order
-        messages = []
-        for row in reversed(rows):
-            msg = {
-                "id": str(row["id"]),
-                "role": row["role"],
-                "content": row["content"],
-                "timestamp": row["timestamp"],
-            }
-            if row["metadata"]:
-                msg["metadata"] = json.loads(row["metadata"])
-            messages.append(msg)
-
-        return messages
+            async for row in cursor:
+                msg = {
+                    "id": str(row["id"]),
+                    "role": row["role"],
+                    "content": row["content"],
+                    "timestamp": row["timestamp"],
+                }
+                if row["metadata"]:
+                    msg["metadata"] = json.loads(row["metadata"])
+                yield msg
 
     async def clear_history(self, session_id: str) -> None:
         """Clear conversation history for a session."""
@@ -32,6 +32,7 @@ import asyncio
 
 from langgraph.graph import StateGraph, END
 
+from rag.semantic_cache import SemanticCache
 from rag.state import RAGState, create_initial_state
 from rag.nodes import RAGNodes, needs_rag, should_rewrite, has_relevant_docs, should_retry
 from rag.prompts import (
@@ -70,6 +71,13 @@ class RAGPipeline:
 
         self.nodes = RAGNodes(self.llm, self.vectorstore, self.memory)
         self.graph = self._build_graph()
+        
+        # Results of standalone questions, reused by aquery (opt-in)
+        self.answer_cache = (
+            SemanticCache(settings.semantic_cache_threshold, settings.semantic_cache_size)
+            if settings.semantic_cache_enabled
+            else None
+        )
     
     def _create_llm(self):
         """Create LLM based on settings."""
@@ -105,8 +113,8 @@ class RAGPipeline:
     
     def _create_vectorstore(self):
         """Create vector store based on settings."""
-        from vectorstore import VectorStore
-        return VectorStore()
+        from vectorstore import get_default_store
+        return get_default_store()
     
     def _init_hybrid_retriever(self):
         """Initialize HybridRetriever singleton."""
@@ -230,6 +238,29 @@ class RAGPipeline:
         
         logger.info(f"Starting RAG query: '{question[:50]}...' in collection '{collection}'")
         
+        # Answers only depend on the question and the collection when there
+        # is no conversation to resolve it against
+        cache = self.answer_cache
+        if cache is not None:
+            version = self.vectorstore.collection_version(collection)
+            cached = cache.get_exact(collection, version, question)
+            vector = None
+            if cached is None:
+                vector = await self.vectorstore.query_embedder.submit(question)
+                cached = cache.get_similar(collection, version, vector)
+            if cached is not None and await self._has_prior_turns(session_id):
+                cache = None
+            elif cached is not None:
+                logger.info("RAG query answered from semantic cache")
+                # Still recorded, so follow-ups in this session have context
+                await self.nodes.save_to_memory({
+                    "session_id": session_id,
+                    "question": question,
+                    "answer": cached["answer"],
+                    "sources": cached["sources"],
+                })
+                return {**cached, "processing_steps": ["semantic_cache", "save_to_memory"]}
+        
         initial_state = create_initial_state(
             question=question,
             session_id=session_id,
@@ -241,7 +272,7 @@ class RAGPipeline:
         
         logger.info(f"RAG query complete. Steps: {final_state['processing_steps']}")
         
-        return {
+        result = {
             "answer": final_state["answer"],
             "sources": final_state["sources"],
             "is_grounded": final_state["is_grounded"],
@@ -253,6 +284,24 @@ class RAGPipeline:
             "detected_intent": final_state.get("detected_intent"),
             "intent_confidence": final_state.get("intent_confidence"),
         }
+        # Only grounded answers to document questions are worth repeating
+        if (
+            cache is not None
+            and final_state.get("detected_intent") == "question"
+            and final_state["is_grounded"]
+            # The graph has already saved this turn's question and answer
+            and not await self._has_prior_turns(session_id, saved=2)
+        ):
+            if vector is None:
+                vector = await self.vectorstore.query_embedder.submit(question)
+            cache.set(collection, version, question, vector, result)
+        
+        return result
+    
+    async def _has_prior_turns(self, session_id: str, saved: int = 0) -> bool:
+        """Whether the session has messages beyond the last `saved` ones."""
+        history = await self.memory.get_history(session_id, limit=saved + 1)
+        return len(history) > saved
     
     async def astream(
         self,
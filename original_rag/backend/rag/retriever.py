@@ -23,6 +23,7 @@ References:
 - RRF Paper: https://plg.uwaterloo.ca/~gvcormac/cormacksigir09-rrf.pdf
 """
 import logging
+import threading
 from typing import List, Tuple, Dict, Optional, Any
 from dataclasses import dataclass, field
 
@@ -445,6 +446,7 @@ class HybridRetriever:
 
 # Singleton instance (initialized lazily in pipeline)
 _hybrid_retriever: Optional[HybridRetriever] = None
+_hybrid_retriever_lock = threading.Lock()
 
 
 def get_hybrid_retriever(vector_store=None) -> HybridRetriever:
@@ -460,10 +462,14 @@ def get_hybrid_retriever(vector_store=None) -> HybridRetriever:
     global _hybrid_retriever
     
     if _hybrid_retriever is None:
-        if vector_store is None:
-            raise ValueError("vector_store required for first initialization")
-        _hybrid_retriever = HybridRetriever(vector_store)
-        logger.info("HybridRetriever initialized")
+        # Locked like get_default_store: a pipeline built in a worker thread
+        # can race the ingestion service's first call
+        with _hybrid_retriever_lock:
+            if _hybrid_retriever is None:
+                if vector_store is None:
+                    raise ValueError("vector_store required for first initialization")
+                _hybrid_retriever = HybridRetriever(vector_store)
+                logger.info("HybridRetriever initialized")
     
     return _hybrid_retriever
 
@@ -471,4 +477,5 @@ def get_hybrid_retriever(vector_store=None) -> HybridRetriever:
 def reset_hybrid_retriever() -> None:
     """Reset the singleton (for testing)."""
     global _hybrid_retriever
-    _hybrid_retriever = None
+    with _hybrid_retriever_lock:
+        _hybrid_retriever = None
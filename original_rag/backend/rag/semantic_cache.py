@@ -0,0 +1,100 @@
+"""
+Semantic Answer Cache
+Reuses pipeline results for questions already answered against the same
+collection contents.
+
+Two layers, per collection:
+- Exact: normalized question text -> result (no embedding needed)
+- Semantic: cosine similarity of the question embedding against the cached
+  questions, accepted at or above the threshold
+
+Entries are tagged with the vector store's collection version; any write to
+the collection (ingest, delete) bumps the version and drops its entries on
+the next lookup.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_question(question: str) -> str:
+    """Exact-match key: case and whitespace differences are ignored."""
+    return " ".join(question.lower().split())
+
+
+class _CollectionCache:
+    """Cached results for one version of one collection."""
+
+    def __init__(self, version: int) -> None:
+        self.version = version
+        # normalized question -> (unit vector, result), oldest first
+        self.entries: "OrderedDict[str, Tuple[np.ndarray, dict]]" = OrderedDict()
+        # Stacked vectors and matching results, rebuilt after inserts
+        self.matrix: Optional[np.ndarray] = None
+        self.results: List[dict] = []
+
+
+class SemanticCache:
+    """In-process semantic cache of RAG results."""
+
+    def __init__(self, threshold: float, maxsize: int) -> None:
+        self.threshold = threshold
+        # Entries kept per collection; the oldest is evicted first
+        self.maxsize = maxsize
+        self._collections: Dict[str, _CollectionCache] = {}
+
+    def _get_collection(self, collection: str, version: int) -> _CollectionCache:
+        cache = self._collections.get(collection)
+        if cache is None or cache.version != version:
+            cache = self._collections[collection] = _CollectionCache(version)
+        return cache
+
+    def get_exact(self, collection: str, version: int, question: str) -> Optional[dict]:
+        """Return the result cached for this exact question, if any."""
+        entry = self._get_collection(collection, version).entries.get(normalize_question(question))
+        return entry[1] if entry is not None else None
+
+    def get_similar(self, collection: str, version: int, vector: Sequence[float]) -> Optional[dict]:
+        """Return the result of the most similar cached question above the threshold."""
+        cache = self._get_collection(collection, version)
+        if not cache.entries:
+            return None
+        if cache.matrix is None:
+            vectors, results = zip(*cache.entries.values())
+            cache.matrix = np.stack(vectors)
+            cache.results = list(results)
+        scores = cache.matrix @ _unit(vector)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return cache.results[best]
+
+    def set(
+        self,
+        collection: str,
+        version: int,
+        question: str,
+        vector: Sequence[float],
+        result: dict,
+    ) -> None:
+        """Cache a result under both the question text and its embedding."""
+        current = self._collections.get(collection)
+        if current is not None and current.version > version:
+            return  # The collection changed while this result was computed
+        cache = self._get_collection(collection, version)
+        cache.entries[normalize_question(question)] = (_unit(vector), result)
+        if len(cache.entries) > self.maxsize:
+            cache.entries.popitem(last=False)
+        cache.matrix = None
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._collections.clear()
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    """Vector as float32 scaled to unit length, so dot products are cosines."""
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(arr)
+    return arr / norm if norm else arr
@@ -117,6 +117,49 @@ class TestEvaluationReport:
         assert "Summary" in report
         assert "0.9" in report or "90" in report
 
+class TestSemanticCache:
+    """Test the semantic answer cache"""
+
+    def test_exact_match_ignores_case_and_whitespace(self):
+        from rag.semantic_cache import SemanticCache
+
+        cache = SemanticCache(threshold=0.9, maxsize=10)
+        cache.set("kb", 0, "What is a CDN?", [1.0, 0.0], {"answer": "A"})
+
+        assert cache.get_exact("kb", 0, "  what is a  cdn? ") == {"answer": "A"}
+        assert cache.get_exact("kb", 0, "What is DNS?") is None
+
+    def test_similar_match_uses_threshold(self):
+        from rag.semantic_cache import SemanticCache
+
+        cache = SemanticCache(threshold=0.9, maxsize=10)
+        cache.set("kb", 0, "What is a CDN?", [1.0, 0.0], {"answer": "A"})
+
+        assert cache.get_similar("kb", 0, [0.99, 0.05]) == {"answer": "A"}
+        assert cache.get_similar("kb", 0, [0.5, 0.5]) is None
+
+    def test_collection_write_invalidates(self):
+        from rag.semantic_cache import SemanticCache
+
+        cache = SemanticCache(threshold=0.9, maxsize=10)
+        cache.set("kb", 0, "What is a CDN?", [1.0, 0.0], {"answer": "A"})
+
+        assert cache.get_exact("kb", 1, "What is a CDN?") is None
+        # A result computed before the write is not stored
+        cache.set("kb", 0, "What is a CDN?", [1.0, 0.0], {"answer": "A"})
+        assert cache.get_exact("kb", 1, "What is a CDN?") is None
+
+    def test_evicts_oldest(self):
+        from rag.semantic_cache import SemanticCache
+
+        cache = SemanticCache(threshold=0.9, maxsize=1)
+        cache.set("kb", 0, "first", [1.0, 0.0], {"answer": "1"})
+        cache.set("kb", 0, "second", [0.0, 1.0], {"answer": "2"})
+
+        assert cache.get_exact("kb", 0, "first") is None
+        assert cache.get_similar("kb", 0, [1.0, 0.0]) is None
+        assert cache.get_exact("kb", 0, "second") == {"answer": "2"}
+
 @pytest.mark.asyncio
 class TestAPI:
     """Test FastAPI endpoints"""
@@ -1,4 +1,4 @@
 """Vector Store Module."""
-from .store import VectorStore, ChromaVectorStore
+from .store import VectorStore, ChromaVectorStore, get_default_store
 
-__all__ = ["VectorStore", "ChromaVectorStore"]
+__all__ = ["VectorStore", "ChromaVectorStore", "get_default_store"]
@@ -7,9 +7,16 @@ Changes from V2:
 - Added FastEmbed support (BAAI/bge-small-en-v1.5)
 - Simplified embedding factory
 """
-from typing import Optional, Dict, Any, List
+import asyncio
+import hashlib
+import itertools
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
+import threading
 import uuid
 
 from langchain_core.documents import Document
@@ -19,6 +26,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Embedding batches of one add_documents call in flight at once
+EMBED_BATCH_CONCURRENCY = 4
+
 
 # =============================================================================
 # EMBEDDING IMPLEMENTATIONS
@@ -68,6 +78,10 @@ class FastEmbedEmbeddings(Embeddings):
         embeddings = list(self.model.embed([text]))
         return embeddings[0].tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries in one model call (queries take no prefix)."""
+        return self.embed_documents(texts)
+
 
 class OllamaEmbeddings(Embeddings):
     """
@@ -104,6 +118,10 @@ class OllamaEmbeddings(Embeddings):
         """Embed a single query."""
         return self._embeddings.embed_query(text)
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries (one HTTP call each, with the query instruction)."""
+        return [self._embeddings.embed_query(text) for text in texts]
+
 
 class OpenAIEmbeddings(Embeddings):
     """
@@ -137,6 +155,77 @@ class OpenAIEmbeddings(Embeddings):
         """Embed a single query."""
         return self._embeddings.embed_query(text)
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries in one API request."""
+        return self._embeddings.embed_documents(texts)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps another embeddings instance with a persistent SQLite cache.
+
+    Vectors are stored as float32 bytes keyed by sha256 of the model name
+    and text, so repeated texts (re-ingested documents, fixed benchmark
+    queries) skip the model. Query embeddings are only cached when
+    cache_queries is set.
+    """
+
+    def __init__(self, embeddings: Embeddings, path: Path, cache_queries: bool = False):
+        self._embeddings = embeddings
+        self.model_name = embeddings.model_name
+        self.cache_queries = cache_queries
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Embedding runs in worker threads (asyncio.to_thread); one shared
+        # connection, serialized by the lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        logger.info(f"Embedding cache enabled: {path}")
+
+    def _key(self, kind: str, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}::{kind}::{text}".encode()).digest()
+
+    def _cached(self, kind: str, texts: List[str], embed: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        """Look up texts, embed only the misses, and store them."""
+        keys = [self._key(kind, text) for text in texts]
+        found: Dict[bytes, bytes] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                found.update(self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ))
+
+        misses = [i for i, key in enumerate(keys) if key not in found]
+        if misses:
+            computed = embed([texts[i] for i in misses])
+            rows = [(keys[i], array("f", vector).tobytes()) for i, vector in zip(misses, computed)]
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?)", rows)
+            found.update(rows)
+
+        return [array("f", found[key]).tolist() for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, reusing cached vectors."""
+        if not texts:
+            return []
+        return self._cached("doc", texts, self._embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries, cached only if cache_queries is set."""
+        if not self.cache_queries:
+            return self._embeddings.embed_queries(texts)
+        return self._cached("query", texts, self._embeddings.embed_queries)
+
 
 def create_embeddings() -> Embeddings:
     """
@@ -148,22 +237,84 @@ def create_embeddings() -> Embeddings:
     provider = settings.embedding_provider
     
     if provider == "fastembed":
-        return FastEmbedEmbeddings(
+        embeddings = FastEmbedEmbeddings(
             model_name=settings.fastembed_model,
             batch_size=settings.fastembed_batch_size,
         )
     elif provider == "ollama":
-        return OllamaEmbeddings(
+        embeddings = OllamaEmbeddings(
             model_name=settings.ollama_embedding_model,
             base_url=settings.ollama_base_url,
         )
     elif provider == "openai":
-        return OpenAIEmbeddings(
+        embeddings = OpenAIEmbeddings(
             model_name=settings.openai_embedding_model,
             api_key=settings.openai_api_key,
         )
     else:
         raise ValueError(f"Unknown embedding provider: {provider}")
+    
+    if settings.embedding_cache_enabled:
+        return CachedEmbeddings(
+            embeddings,
+            settings.data_dir / "embedding_cache.sqlite",
+            cache_queries=settings.embedding_cache_for_queries,
+        )
+    return embeddings
+
+
+class CallBatcher:
+    """
+    Coalesces concurrent calls into one batched call run off the event loop.
+
+    batch_fn takes a list of items and returns one result per item. A lone
+    call runs on the next loop iteration, with no wait window. Calls that
+    arrive while a batch is running are queued and go together in the next
+    batch, so concurrent requests share model and index calls instead of
+    each paying for its own.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch: int):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Run batch_fn for one item, batched with any others in flight."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+        return await future
+
+    async def _drain(self) -> None:
+        """Run pending items batch by batch until none are left."""
+        try:
+            # Let the callers that are already runnable queue up first
+            await asyncio.sleep(0)
+            while self._pending:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                try:
+                    results = await asyncio.to_thread(self.batch_fn, [item for item, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+                if len(results) < len(batch):
+                    error = RuntimeError(
+                        f"batch_fn returned {len(results)} results for {len(batch)} items"
+                    )
+                    for _, future in batch[len(results):]:
+                        if not future.done():
+                            future.set_exception(error)
+        finally:
+            self._task = None
 
 
 # =============================================================================
@@ -198,7 +349,26 @@ class ChromaVectorStore:
     
     def __init__(self):
         self.embeddings = create_embeddings()
+        self.query_embedder = CallBatcher(self.embeddings.embed_queries, settings.fastembed_batch_size)
         self._stores: Dict[str, Any] = {}
+        # collection name -> CallBatcher of (embedding, k) searches
+        self._searches: Dict[str, CallBatcher] = {}
+        # collection name -> version, drawn from one counter shared by all
+        # collections so a deleted and recreated collection never reuses one
+        self._versions: Dict[str, int] = {}
+        self._version_counter = itertools.count()
+    
+    def collection_version(self, collection_name: str) -> int:
+        """Version that grows on every write, for caches of collection contents."""
+        version = self._versions.get(collection_name)
+        if version is None:
+            version = self._versions[collection_name] = next(self._version_counter)
+        return version
+    
+    def _invalidate(self, collection_name: str) -> None:
+        """Drop the cached LangChain store and bump the collection version."""
+        self._stores.pop(collection_name, None)
+        self._versions[collection_name] = next(self._version_counter)
     
     def _get_store(self, collection_name: str):
         """Get or create a LangChain Chroma store for a collection."""
@@ -214,6 +384,15 @@ class ChromaVectorStore:
         
         return self._stores[collection_name]
     
+    def _chroma_collection(self, collection_name: str):
+        """
+        The chromadb collection behind a collection's LangChain store.
+        
+        langchain_chroma has no public accessor for it; this is the one
+        place that reaches into the store for it.
+        """
+        return self._get_store(collection_name)._collection
+    
     async def add_documents(
         self,
         documents: List[Document],
@@ -242,27 +421,60 @@ class ChromaVectorStore:
         
         # Extract texts
         texts = [doc.page_content for doc in documents]
-        
-        # Batch embed all documents at once
-        logger.info(f"Batch embedding {len(texts)} documents...")
-        embeddings = self.embeddings.embed_documents(texts)
-        logger.info(f"Batch embedding complete")
-        
-        # Prepare data for batch insert
         ids = [str(uuid.uuid4()) for _ in documents]
         metadatas = [doc.metadata for doc in documents]
         
-        # Add all at once with pre-computed embeddings
-        chroma_collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=texts,
-            metadatas=metadatas
-        )
+        # Embed and insert batch by batch, off the event loop, so one batch
+        # is stored while the next is embedded (and HTTP embedding providers
+        # get several requests in flight)
+        batch_size = settings.fastembed_batch_size
+        semaphore = asyncio.Semaphore(EMBED_BATCH_CONCURRENCY)
+        inserted: List[str] = []
         
-        # Invalidate cached store to pick up new documents
-        if collection in self._stores:
-            del self._stores[collection]
+        async def embed_and_insert(start: int) -> None:
+            end = start + batch_size
+            async with semaphore:
+                embeddings = await asyncio.to_thread(self.embeddings.embed_documents, texts[start:end])
+            # Recorded up front: deleting ids that were never stored is harmless
+            inserted.extend(ids[start:end])
+            add = asyncio.ensure_future(asyncio.to_thread(
+                chroma_collection.add,
+                ids=ids[start:end],
+                embeddings=embeddings,
+                documents=texts[start:end],
+                metadatas=metadatas[start:end]
+            ))
+            try:
+                await asyncio.shield(add)
+            except asyncio.CancelledError:
+                # The thread runs on regardless; let it finish so the
+                # rollback also removes what it stores
+                await asyncio.wait([add])
+                raise
+        
+        logger.info(f"Batch embedding {len(texts)} documents...")
+        try:
+            # A failed batch cancels the others
+            async with asyncio.TaskGroup() as tg:
+                for start in range(0, len(texts), batch_size):
+                    tg.create_task(embed_and_insert(start))
+        except BaseException as e:
+            # Roll back the batches already stored, so a failed ingest
+            # leaves no partial document behind
+            if inserted:
+                logger.warning(f"Batch embedding failed, removing {len(inserted)} inserted chunks")
+                try:
+                    await asyncio.to_thread(chroma_collection.delete, ids=inserted)
+                except Exception as delete_error:
+                    logger.error(f"Could not remove partially inserted chunks: {delete_error}")
+            # Callers see the failing batch's error, as with a single call
+            if isinstance(e, BaseExceptionGroup):
+                raise e.exceptions[0]
+            raise
+        finally:
+            # Invalidate cached store to pick up new documents
+            self._invalidate(collection)
+        logger.info(f"Batch embedding complete")
         
         return ids
     
@@ -273,10 +485,8 @@ class ChromaVectorStore:
         k: int = 5
     ) -> List[Document]:
         """Search ChromaDB for similar documents."""
-        collection = collection_name or settings.collection_name
-        store = self._get_store(collection)
-        
-        return store.similarity_search(query, k=k)
+        results = await self.similarity_search_with_score(query, collection_name, k)
+        return [doc for doc, _ in results]
     
     async def similarity_search_with_score(
         self,
@@ -284,30 +494,88 @@ class ChromaVectorStore:
         collection_name: str | None = None,
         k: int = 5
     ) -> List[tuple[Document, float]]:
-        """Search ChromaDB with scores."""
+        """
+        Search ChromaDB with scores (distances, lower is closer).
+        
+        Concurrent searches share one embedding call and, per collection,
+        one Chroma query, both run off the event loop.
+        """
         collection = collection_name or settings.collection_name
-        store = self._get_store(collection)
+        searches = self._searches.get(collection)
+        if searches is None:
+            searches = self._searches[collection] = CallBatcher(
+                self._query_batch,
+                settings.fastembed_batch_size,
+            )
         
-        return store.similarity_search_with_score(query, k=k)
+        embedding = await self.query_embedder.submit(query)
+        # Resolved here, on the loop, so the worker thread never touches
+        # the store cache
+        chroma_collection = self._chroma_collection(collection)
+        return await searches.submit((chroma_collection, embedding, k))
+    
+    @staticmethod
+    def _query_batch(
+        requests: List[Tuple[Any, List[float], int]],
+    ) -> List[List[tuple[Document, float]]]:
+        """Answer several (collection, embedding, k) searches with one Chroma query."""
+        # One batcher per collection name, so every request targets the
+        # same collection
+        chroma_collection = requests[0][0]
+        results = chroma_collection.query(
+            query_embeddings=[embedding for _, embedding, _ in requests],
+            n_results=max(k for _, _, k in requests),
+            include=["documents", "metadatas", "distances"],
+        )
+        # Per query, the top k of the largest k requested is its top k
+        return [
+            [
+                (Document(page_content=text, metadata=metadata or {}), distance)
+                for text, metadata, distance in zip(texts[:k], metadatas[:k], distances[:k])
+            ]
+            for (_, _, k), texts, metadatas, distances in zip(
+                requests, results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
     
     async def delete_collection(self, collection_name: str) -> None:
         """Delete a ChromaDB collection."""
         import chromadb
         client = chromadb.PersistentClient(path=str(settings.chroma_path))
         try:
-            client.delete_collection(name=collection_name)
+            # Removes the segment files; keep the event loop free meanwhile
+            await asyncio.to_thread(client.delete_collection, name=collection_name)
             logger.info(f"Deleted collection: {collection_name}")
         except Exception as e:
             logger.warning(f"Could not delete collection {collection_name}: {e}")
         
-        if collection_name in self._stores:
-            del self._stores[collection_name]
+        self._stores.pop(collection_name, None)
+        self._searches.pop(collection_name, None)
+        self._versions.pop(collection_name, None)
+    
+    def ping(self) -> None:
+        """
+        Round trip to ChromaDB for health checks; raises if it is unusable.
+        Blocking: run via asyncio.to_thread.
+        """
+        import chromadb
+        client = chromadb.PersistentClient(path=str(settings.chroma_path))
+        # Reads the collection catalog, so a broken data directory fails here
+        client.list_collections()
     
     async def list_collections(self) -> List[str]:
         """List all ChromaDB collections."""
         import chromadb
         client = chromadb.PersistentClient(path=str(settings.chroma_path))
         return [c.name for c in client.list_collections()]
+
+    async def list_collections_with_counts(self) -> Dict[str, int]:
+        """Map each ChromaDB collection to its entry (chunk) count."""
+        import chromadb
+        client = chromadb.PersistentClient(path=str(settings.chroma_path))
+        # count() on the listed handles is a local metadata lookup, with no
+        # per-collection get_collection round trip
+        return {c.name: c.count() for c in client.list_collections()}
     
     async def delete_by_metadata(
         self,
@@ -326,14 +594,32 @@ class ChromaVectorStore:
             if count > 0:
                 collection.delete(where=metadata_filter)
                 # Invalidate cached store
-                if collection_name in self._stores:
-                    del self._stores[collection_name]
+                self._invalidate(collection_name)
             
             return count
         except Exception as e:
             logger.error(f"Error deleting by metadata in ChromaDB: {e}")
             return 0
     
+    async def get_collection_stats(self, collection_name: str) -> Tuple[int, int]:
+        """
+        Count (documents, chunks) in a collection, as list_documents would.
+
+        One pass over the doc_id metadata; no per-document records are built.
+        """
+        import chromadb
+        try:
+            client = chromadb.PersistentClient(path=str(settings.chroma_path))
+            collection = client.get_collection(name=collection_name)
+
+            results = collection.get(include=['metadatas'])
+            doc_ids = [m.get('doc_id') for m in results.get('metadatas') or [] if m]
+            doc_ids = [doc_id for doc_id in doc_ids if doc_id]
+            return len(set(doc_ids)), len(doc_ids)
+        except Exception as e:
+            logger.error(f"Error counting documents in ChromaDB: {e}")
+            return 0, 0
+
     async def list_documents(
         self,
         collection_name: str
@@ -456,3 +742,24 @@ def VectorStore() -> ChromaVectorStore:
     """
     logger.info("Using ChromaDB vector store with FastEmbed")
     return ChromaVectorStore()
+
+
+_default_store: Optional[ChromaVectorStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> ChromaVectorStore:
+    """
+    Process-wide shared vector store.
+
+    Each store loads its own embedding model, so the API, the ingestion
+    service and the pipeline all use this one instead of calling VectorStore().
+    """
+    global _default_store
+    if _default_store is None:
+        # Locked: callers may race from worker threads (e.g. a pipeline
+        # built with asyncio.to_thread while ingestion runs)
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = VectorStore()
+    return _default_store